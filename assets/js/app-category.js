@@ -62,6 +62,17 @@ const sanitize = s => (typeof s === 'string') ? s.replaceAll('<','&lt;').replace
 let spotifyData = {};
 
 async function loadSpotifyData(){
+  // Páginas generadas: las playlists vienen incrustadas en el HTML
+  const inline = document.getElementById('spotify-data');
+  if(inline){
+    try {
+      spotifyData = JSON.parse(inline.textContent);
+      return;
+    } catch(e){
+      console.error('Error leyendo spotify-data:', e);
+    }
+  }
+
   try {
     const resp = await fetch('/data/spotify-playlists.json');
     spotifyData = await resp.json();
@@ -197,6 +208,9 @@ async function renderCategoryCards(){
 
   if(!featuredContainer || !allContainer) return;
 
+  // Páginas generadas: los cartones ya vienen renderizados en el HTML
+  if(allContainer.dataset.static === 'true') return;
+
   try {
     const resp = await fetch('/data/downloadable-cards.json');
     const data = await resp.json();
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Almacén de artefactos direccionado por contenido (SHA-256)
+Los mismos PNG están sueltos en cartones-visuales/ y otra vez dentro de
+{cat}-{tamaño}.zip y {cat}-todos.zip en cartones-descargables/. Este script
+guarda cada contenido una sola vez en artefactos/blobs/ y describe las rutas
+publicadas en artefactos/manifest.json:
+
+- Ficheros sueltos (PNG): se sustituyen por enlaces duros al blob.
+- ZIPs: se registran sus entradas; el ZIP se reconstruye desde los blobs.
+
+El almacén es local: artefactos/ no se versiona (.gitignore) y el ahorro
+es solo de disco en la copia de trabajo. Git ya guarda una única vez cada
+contenido idéntico y no conserva enlaces duros, así que el tamaño del
+repositorio no cambia.
+
+Los blobs de los PNG comparten inodo con las rutas publicadas, por lo que
+conservan sus permisos y los generadores nunca deben reescribir un PNG en su
+sitio: escriben un temporal y lo renombran (os.replace). Aun así, `ingest`
+comprueba el SHA-256 de cada blob y descarta los que no coinciden. Solo los
+blobs que no están enlazados a ninguna ruta publicada (entradas de ZIP) son
+de solo lectura.
+
+Comandos:
+    python scripts/artifact-store.py ingest        # Guarda y deduplica
+    python scripts/artifact-store.py materialize   # Recrea las rutas publicadas
+    python scripts/artifact-store.py report        # Disco local ahorrado
+    python scripts/artifact-store.py gc            # Borra blobs huérfanos
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+STORE_DIR = BASE_DIR / 'artefactos'
+BLOBS_DIR = STORE_DIR / 'blobs'
+MANIFEST_PATH = STORE_DIR / 'manifest.json'
+
+# Carpetas con artefactos generados
+LOOSE_DIRS = ['cartones-visuales']
+ZIP_DIRS = ['cartones-descargables']
+LOOSE_PATTERNS = ['*.png']
+
+# Fecha fija en las entradas de los ZIP para que sean reproducibles
+ZIP_DATE_TIME = (2024, 1, 1, 0, 0, 0)
+CHUNK_SIZE = 1024 * 1024
+
+def blob_path(digest):
+    """Ruta del blob: blobs/ab/abcdef..."""
+    return BLOBS_DIR / digest[:2] / digest
+
+def hash_stream(stream, sink=None):
+    """Calcula el SHA-256 de un flujo (y lo copia a sink si se indica)"""
+    sha = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        sha.update(chunk)
+        size += len(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    return sha.hexdigest(), size
+
+def is_read_only(path):
+    return not os.stat(path).st_mode & stat.S_IWUSR
+
+def link_or_copy(src, dst):
+    """
+    Crea dst como enlace duro a src, o como copia normal (con permisos por
+    defecto) si el sistema no lo permite o src es un blob de solo lectura:
+    los ficheros publicados nunca deben quedar de solo lectura.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + '.tmp')
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        if is_read_only(src):
+            raise PermissionError(src)
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def make_read_only(path):
+    """Quita el permiso de escritura a un blob que no está publicado"""
+    os.chmod(path, 0o444)
+
+def load_manifest():
+    """Carga el manifiesto (vacío si aún no existe)"""
+    if not MANIFEST_PATH.exists():
+        return {'version': 1, 'archivos': {}, 'zips': {}}
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    """Guarda el manifiesto de forma atómica, con claves ordenadas"""
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, MANIFEST_PATH)
+
+def relative(path):
+    return path.relative_to(BASE_DIR).as_posix()
+
+def store_file(path, stats):
+    """
+    Guarda un fichero suelto en el almacén y lo sustituye por un enlace
+    duro al blob. Devuelve el SHA-256.
+    """
+    with open(path, 'rb') as f:
+        digest, size = hash_stream(f)
+    blob = blob_path(digest)
+    stats['bytes'] += size
+
+    if blob.exists():
+        if os.path.samefile(blob, path):
+            return digest
+        stats['duplicados'] += size
+        link_or_copy(blob, path)
+    else:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except OSError:
+            shutil.copy2(path, blob)
+        stats['nuevos'] += 1
+    return digest
+
+def store_zip(path, stats):
+    """Guarda cada entrada de un ZIP en el almacén y devuelve su lista"""
+    entries = []
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            stats['bytes'] += info.file_size
+            BLOBS_DIR.mkdir(parents=True, exist_ok=True)
+            with zf.open(info) as src, tempfile.NamedTemporaryFile(dir=BLOBS_DIR, delete=False) as tmp:
+                digest, size = hash_stream(src, tmp)
+            blob = blob_path(digest)
+            if blob.exists():
+                os.unlink(tmp.name)
+                stats['duplicados'] += size
+            else:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp.name, blob)
+                make_read_only(blob)
+                stats['nuevos'] += 1
+            entries.append({'nombre': info.filename, 'sha256': digest,
+                            'crc32': info.CRC, 'bytes': info.file_size})
+    return entries
+
+def verify_blobs():
+    """
+    Comprueba que cada blob sigue conteniendo lo que dice su nombre y borra
+    los que no (p. ej. un PNG reescrito en su sitio a través del enlace
+    duro). Devuelve cuántos se han descartado.
+    """
+    corrupt = 0
+    if not BLOBS_DIR.exists():
+        return corrupt
+    for blob in sorted(BLOBS_DIR.glob('*/*')):
+        # Un blob enlazado a un PNG publicado no puede ser de solo lectura
+        if blob.stat().st_nlink > 1 and is_read_only(blob):
+            os.chmod(blob, 0o644)
+        with open(blob, 'rb') as f:
+            digest, _ = hash_stream(f)
+        if digest != blob.name:
+            print(f"   ⚠️  Blob corrupto descartado: {blob.name[:12]}… (contiene {digest[:12]}…)")
+            os.chmod(blob, 0o644)
+            blob.unlink()
+            corrupt += 1
+    return corrupt
+
+def ingest():
+    """
+    Recorre los artefactos publicados y los guarda en el almacén. El
+    manifiesto se reconstruye desde el árbol actual: lo que ya no existe deja
+    de estar referenciado y `gc` puede borrar sus blobs.
+    """
+    manifest = {'version': 1, 'archivos': {}, 'zips': {}}
+    stats = {'bytes': 0, 'duplicados': 0, 'nuevos': 0}
+
+    print("📥 Guardando artefactos en el almacén")
+    print("=" * 60)
+
+    corrupt = verify_blobs()
+
+    for folder in LOOSE_DIRS:
+        for pattern in LOOSE_PATTERNS:
+            for path in sorted((BASE_DIR / folder).glob(f'**/{pattern}')):
+                manifest['archivos'][relative(path)] = store_file(path, stats)
+
+    for folder in ZIP_DIRS:
+        for path in sorted((BASE_DIR / folder).glob('**/*.zip')):
+            manifest['zips'][relative(path)] = store_zip(path, stats)
+            print(f"   ✅ {relative(path)} ({len(manifest['zips'][relative(path)])} entradas)")
+
+    save_manifest(manifest)
+
+    print("\n" + "=" * 60)
+    print(f"✅ {stats['nuevos']} blobs nuevos")
+    if corrupt:
+        print(f"⚠️  {corrupt} blobs corruptos descartados (se han vuelto a guardar desde los ficheros publicados)")
+    print(f"♻️  {stats['duplicados'] / (1024 * 1024):.2f} MB duplicados en disco local "
+          f"de {stats['bytes'] / (1024 * 1024):.2f} MB leídos (el repositorio git no cambia)")
+    print(f"📄 Manifiesto: {MANIFEST_PATH}")
+    print("=" * 60)
+
+def zip_matches(path, entries):
+    """
+    ¿Tiene el ZIP publicado exactamente las entradas del manifiesto?
+    Compara nombres, CRC-32 y tamaños (o el SHA-256 si el manifiesto es
+    anterior y no guarda el CRC).
+    """
+    if not path.exists():
+        return False
+    try:
+        with zipfile.ZipFile(path) as zf:
+            infos = [info for info in zf.infolist() if not info.is_dir()]
+            if [info.filename for info in infos] != [e['nombre'] for e in entries]:
+                return False
+            for info, entry in zip(infos, entries):
+                if 'crc32' in entry:
+                    if (info.CRC, info.file_size) != (entry['crc32'], entry['bytes']):
+                        return False
+                else:
+                    with zf.open(info) as src:
+                        if hash_stream(src)[0] != entry['sha256']:
+                            return False
+    except zipfile.BadZipFile:
+        return False
+    return True
+
+def load_zip_builder():
+    """Carga create-downloadable-zips.py (nombre con guiones)"""
+    script = Path(__file__).parent / 'create-downloadable-zips.py'
+    spec = importlib.util.spec_from_file_location('create_downloadable_zips', script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def materialize(force=False):
+    """
+    Recrea las rutas publicadas a partir del manifiesto. Si reconstruye algún
+    ZIP, regenera downloads-index.json para que los tamaños coincidan.
+    """
+    manifest = load_manifest()
+    missing = 0
+    rebuilt = 0
+
+    print("📤 Materializando artefactos publicados")
+    print("=" * 60)
+
+    for rel_path, digest in manifest['archivos'].items():
+        blob = blob_path(digest)
+        target = BASE_DIR / rel_path
+        if not blob.exists():
+            print(f"   ❌ Falta el blob de {rel_path}")
+            missing += 1
+            continue
+        if target.exists() and os.path.samefile(blob, target) and not force:
+            continue
+        link_or_copy(blob, target)
+
+    for rel_path, entries in manifest['zips'].items():
+        target = BASE_DIR / rel_path
+        if not force and zip_matches(target, entries):
+            continue
+        absent = [e['nombre'] for e in entries if not blob_path(e['sha256']).exists()]
+        if absent:
+            print(f"   ❌ Faltan {len(absent)} blobs de {rel_path}")
+            missing += 1
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for entry in entries:
+                info = zipfile.ZipInfo(entry['nombre'], date_time=ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(blob_path(entry['sha256']), 'rb') as src, zf.open(info, 'w') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        os.replace(tmp, target)
+        rebuilt += 1
+        print(f"   ✅ {rel_path}")
+
+    if rebuilt:
+        builder = load_zip_builder()
+        builder.create_download_index(BASE_DIR / 'cartones-descargables', builder.CATEGORIES)
+
+    print("=" * 60)
+    if missing:
+        print(f"⚠️  {missing} artefactos no se han podido materializar")
+        sys.exit(1)
+    print("✅ Artefactos materializados")
+
+def referenced_blobs(manifest):
+    """Conjunto de SHA-256 referenciados por el manifiesto"""
+    refs = set(manifest['archivos'].values())
+    for entries in manifest['zips'].values():
+        refs.update(e['sha256'] for e in entries)
+    return refs
+
+def report():
+    """Muestra cuánto disco local se ahorra gracias a los enlaces duros"""
+    manifest = load_manifest()
+    refs = referenced_blobs(manifest)
+
+    sizes = {}
+    for digest in refs:
+        blob = blob_path(digest)
+        sizes[digest] = blob.stat().st_size if blob.exists() else 0
+
+    logical = sum(sizes[d] for d in manifest['archivos'].values())
+    logical += sum(sizes[e['sha256']] for entries in manifest['zips'].values() for e in entries)
+    stored = sum(sizes.values())
+
+    # Duplicados por carpeta publicada (p. ej. rock y rock-clasico comparten cartones-visuales/rock)
+    by_folder = {}
+    seen = set()
+    for rel_path, digest in sorted(manifest['archivos'].items()):
+        folder = rel_path.rsplit('/', 1)[0]
+        if digest in seen:
+            by_folder[folder] = by_folder.get(folder, 0) + sizes[digest]
+        seen.add(digest)
+    for rel_path, entries in sorted(manifest['zips'].items()):
+        folder = rel_path.rsplit('/', 1)[0]
+        for entry in entries:
+            if entry['sha256'] in seen:
+                by_folder[folder] = by_folder.get(folder, 0) + sizes[entry['sha256']]
+            seen.add(entry['sha256'])
+
+    print("📊 Informe del almacén de artefactos")
+    print("=" * 60)
+    print(f"   Rutas publicadas: {len(manifest['archivos'])} ficheros + {len(manifest['zips'])} ZIPs")
+    print(f"   Blobs únicos:     {len(refs)}")
+    print(f"   Tamaño lógico:    {logical / (1024 * 1024):.2f} MB")
+    print(f"   Tamaño real:      {stored / (1024 * 1024):.2f} MB")
+    print(f"   ♻️  Ahorro en disco local: {(logical - stored) / (1024 * 1024):.2f} MB")
+    print("   (artefactos/ no se versiona: el tamaño del repositorio git no cambia)")
+    if by_folder:
+        print("\n   Duplicados por carpeta:")
+        for folder, size in sorted(by_folder.items(), key=lambda item: -item[1]):
+            print(f"   - {folder}: {size / (1024 * 1024):.2f} MB")
+    print("=" * 60)
+
+def gc(dry_run=False):
+    """Elimina los blobs que ya no referencia el manifiesto"""
+    manifest = load_manifest()
+    refs = referenced_blobs(manifest)
+    removed = 0
+    freed = 0
+
+    if BLOBS_DIR.exists():
+        for blob in sorted(BLOBS_DIR.glob('*/*')):
+            if blob.name in refs:
+                continue
+            freed += blob.stat().st_size
+            removed += 1
+            if not dry_run:
+                os.chmod(blob, 0o644)  # Los blobs de entradas de ZIP son de solo lectura
+                blob.unlink()
+        # Temporales de una ingesta interrumpida
+        for tmp in BLOBS_DIR.glob('tmp*'):
+            if not dry_run:
+                tmp.unlink()
+
+    action = 'Se borrarían' if dry_run else 'Borrados'
+    print(f"🧹 {action} {removed} blobs huérfanos ({freed / (1024 * 1024):.2f} MB)")
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description='Almacén de artefactos direccionado por contenido')
+    commands = parser.add_subparsers(dest='comando', required=True)
+    commands.add_parser('ingest', help='Guarda los artefactos publicados en el almacén')
+    materialize_parser = commands.add_parser('materialize', help='Recrea las rutas publicadas')
+    materialize_parser.add_argument('--forzar', action='store_true', help='Reescribe aunque ya existan')
+    commands.add_parser('report', help='Informe del disco local ahorrado')
+    gc_parser = commands.add_parser('gc', help='Borra blobs huérfanos')
+    gc_parser.add_argument('--simular', action='store_true', help='Solo muestra lo que se borraría')
+    args = parser.parse_args()
+
+    if args.comando == 'ingest':
+        ingest()
+    elif args.comando == 'materialize':
+        materialize(force=args.forzar)
+    elif args.comando == 'report':
+        report()
+    elif args.comando == 'gc':
+        gc(dry_run=args.simular)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Generador de páginas de categoría de Bingo Musical
+Construye rock.html, navidad.html, otono.html... a partir de:
+
+- data/category-pages.json      (textos, colores, color del texto sobre el color y SEO de cada página)
+- data/playlists.json           (listado de canciones, que se incrusta en la página)
+- data/downloadable-cards.json  (archivos descargables)
+- data/spotify-playlists.json   (playlists del modal)
+- cartones-descargables/        (ZIPs: nº de cartones, tamaño y miniaturas)
+
+El listado de canciones, las miniaturas y los archivos van incrustados en el
+HTML para que la página no tenga que cargar nada más al abrirse. La salida se
+minifica y solo se reconstruyen las páginas cuyas entradas han cambiado.
+
+Uso:
+    python scripts/build-category-pages.py            # Solo páginas modificadas
+    python scripts/build-category-pages.py --forzar   # Todas
+    python scripts/build-category-pages.py rock otono
+"""
+
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import re
+import zipfile
+from pathlib import Path
+from string import Template
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None  # Sin Pillow no se incrustan miniaturas
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+ZIPS_DIR = BASE_DIR / 'cartones-descargables'
+TEMPLATE_PATH = Path(__file__).parent / 'templates' / 'categoria.html'
+BUILD_STATE_PATH = DATA_DIR / 'category-pages-build.json'
+
+SIZES = {
+    'pequeños': {'formato': 'Formato 3×4', 'detalle': '8 canciones por cartón'},
+    'medianos': {'formato': 'Formato 4×4', 'detalle': '12 canciones + 4 comodines'},
+    'grandes': {'formato': 'Formato 5×4', 'detalle': '15 canciones + 5 comodines'},
+}
+
+THUMBNAIL_WIDTH = 200
+
+# Etiquetas de bloque: se pueden quitar los espacios a su alrededor al minificar
+BLOCK_TAGS = ('html', 'head', 'body', 'header', 'footer', 'main', 'nav', 'section', 'div',
+              'ul', 'ol', 'li', 'p', 'h1', 'h2', 'h3', 'h4', 'meta', 'link', 'title', 'script')
+
+def load_json(name):
+    with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def esc(text):
+    return html.escape(str(text), quote=True)
+
+def hex_to_rgb(color):
+    """'#d4a574' → '212,165,116' (para los rgba() de los degradados)"""
+    color = color.lstrip('#')
+    return ','.join(str(int(color[i:i + 2], 16)) for i in (0, 2, 4))
+
+def zip_summary(path):
+    """Nº de cartones, tamaño en MB y huella (CRC de las entradas) de un ZIP"""
+    with zipfile.ZipFile(path) as zf:
+        entries = [info for info in zf.infolist() if not info.is_dir()]
+    fingerprint = [(info.filename, info.CRC, info.file_size) for info in entries]
+    return {
+        'ruta': path.relative_to(BASE_DIR).as_posix(),
+        'cartones': len(entries),
+        'mb': path.stat().st_size / (1024 * 1024),
+        'primero': entries[0].filename if entries else None,
+        'huella': fingerprint,
+    }
+
+def make_thumbnail(zip_path, member):
+    """Miniatura WebP de un cartón del ZIP, como data URI"""
+    if Image is None or member is None:
+        return None
+    with zipfile.ZipFile(zip_path) as zf, zf.open(member) as f:
+        img = Image.open(io.BytesIO(f.read())).convert('RGB')
+    height = round(img.height * THUMBNAIL_WIDTH / img.width)
+    img = img.resize((THUMBNAIL_WIDTH, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, 'WEBP', quality=60, method=6)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def collect_zips(carpeta):
+    """ZIPs publicados de una categoría: {tamaño o 'todos': resumen}"""
+    zips = {}
+    for size in list(SIZES) + ['todos']:
+        path = ZIPS_DIR / carpeta / f'{carpeta}-{size}.zip'
+        if path.exists():
+            zips[size] = zip_summary(path)
+    return zips
+
+def render_size_card(page, size, summary):
+    """Tarjeta de descarga de un tamaño (con miniatura si hay Pillow)"""
+    info = SIZES[size]
+    thumbnail = make_thumbnail(BASE_DIR / summary['ruta'], summary['primero'])
+    thumb_html = ''
+    if thumbnail:
+        thumb_html = (f'<img src="{thumbnail}" alt="Ejemplo de cartón {esc(size)}" width="{THUMBNAIL_WIDTH}" '
+                      f'style="max-width:100%;height:auto;border-radius:8px;margin-bottom:1rem;">')
+    return f'''
+        <!-- {size.capitalize()} -->
+        <div class="download-card" style="background:white;border-radius:12px;padding:1.5rem;box-shadow:0 4px 6px rgba(0,0,0,0.1);text-align:center;">
+          <div style="background:{page['color']};color:{page['text_color']};display:inline-block;padding:0.5rem 1rem;border-radius:20px;font-weight:bold;margin-bottom:1rem;font-size:0.9rem;">
+            {page['emoji']} {size.upper()}
+          </div>
+          {thumb_html}
+          <div style="color:#333;font-size:1.1rem;font-weight:600;margin-bottom:0.5rem;">
+            {info['formato']}
+          </div>
+          <div style="color:var(--muted);font-size:0.9rem;margin-bottom:1rem;">
+            {info['detalle']}
+          </div>
+          <div style="color:#666;font-size:0.85rem;margin-bottom:1.5rem;">
+            📦 {summary['cartones']} cartones · 💾 {summary['mb']:.2f} MB
+          </div>
+          <a href="{esc(summary['ruta'])}" class="btn primary" download style="width:100%;display:block;text-decoration:none;background:{page['color']};color:{page['text_color']};padding:0.75rem;border-radius:8px;font-weight:600;">
+            ⬇️ Descargar
+          </a>
+        </div>'''
+
+def render_pack_card(page, sizes, summary):
+    """Tarjeta del pack con todos los tamaños"""
+    names = [size.capitalize() for size in sizes]
+    included = ' y '.join([', '.join(names[:-1]), names[-1]]) if len(names) > 1 else names[0]
+    return f'''
+        <!-- Pack Completo -->
+        <div class="download-card" style="background:linear-gradient(135deg,{page['color']} 0%,{page['color_oscuro']} 100%);border-radius:12px;padding:1.5rem;box-shadow:0 6px 12px rgba({hex_to_rgb(page['color'])},0.3);text-align:center;transform:scale(1.02);border:2px solid {page['color']};">
+          <div style="background:white;color:{page['color']};display:inline-block;padding:0.5rem 1rem;border-radius:20px;font-weight:bold;margin-bottom:1rem;font-size:0.9rem;">
+            ⭐ PACK COMPLETO
+          </div>
+          <div style="color:{page['text_color']};font-size:1.1rem;font-weight:600;margin-bottom:0.5rem;">
+            Todos los Tamaños
+          </div>
+          <div style="color:rgba({hex_to_rgb(page['text_color'])},0.9);font-size:0.9rem;margin-bottom:1rem;">
+            Incluye: {included}
+          </div>
+          <div style="color:rgba({hex_to_rgb(page['text_color'])},0.8);font-size:0.85rem;margin-bottom:1.5rem;">
+            📦 {summary['cartones']} cartones · 💾 {summary['mb']:.2f} MB
+          </div>
+          <a href="{esc(summary['ruta'])}" class="btn" download style="width:100%;display:block;text-decoration:none;background:white;color:{page['color']};padding:0.75rem;border-radius:8px;font-weight:600;">
+            ⬇️ Descargar Pack
+          </a>
+        </div>'''
+
+def render_file_card(file):
+    """Mismo marcado que createDownloadCard() en app-category.js"""
+    info = f"{file['canciones']} canciones" if file.get('canciones', 0) > 0 else 'En preparación'
+    actions = ''
+    if file.get('ruta') and file['ruta'] != '#':
+        filename = file['ruta'].split('/')[-1]
+        actions += (f'<a href="{esc(file["ruta"])}" download="{esc(filename)}" class="btn primary" '
+                    f'aria-label="Descargar {esc(file["nombre"])}">⬇ Descargar</a>')
+    if file.get('solicitar') is True:
+        actions += '<a href="index.html#about" class="btn ghost">📧 Solicitar cartones</a>'
+    return f'''
+        <div class="download-card card">
+          <h4>{esc(file['nombre'])}</h4>
+          <div class="card-info">{info}</div>
+          <div class="card-actions">{actions}</div>
+        </div>'''
+
+def category_files(category_data):
+    """Archivos de una categoría de downloadable-cards.json (con o sin subcategorías)"""
+    if not category_data:
+        return []
+    if category_data.get('subcategorias'):
+        return [f for sub in category_data['subcategorias'].values() for f in sub.get('archivos', [])]
+    return category_data.get('archivos', [])
+
+def render_seo(page):
+    seo = page.get('seo')
+    if not seo:
+        return ''
+    url = f"https://bingomusical.com/{page['archivo']}"
+    lines = []
+    if seo.get('keywords'):
+        lines.append(f'<meta name="keywords" content="{esc(seo["keywords"])}">')
+    lines.append('<meta name="robots" content="index, follow">')
+    lines.append(f'<link rel="canonical" href="{url}">')
+    lines.append('<meta property="og:type" content="article">')
+    lines.append(f'<meta property="og:url" content="{url}">')
+    for key, tag in (('og_title', 'og:title'), ('og_description', 'og:description')):
+        if seo.get(key):
+            lines.append(f'<meta property="{tag}" content="{esc(seo[key])}">')
+    lines.append('<meta property="og:image" content="https://bingomusical.com/assets/icons/icon-512.png">')
+    lines.append('<meta name="twitter:card" content="summary">')
+    for key, tag in (('twitter_title', 'twitter:title'), ('twitter_description', 'twitter:description')):
+        if seo.get(key):
+            lines.append(f'<meta name="{tag}" content="{esc(seo[key])}">')
+    return '\n  '.join(lines)
+
+def minify_html(text):
+    """
+    Minificación conservadora: quita comentarios, sangrías y espacios
+    alrededor de etiquetas de bloque. Se mantiene un salto de línea donde lo
+    había para que grep y los checks de seguridad sigan viendo cada etiqueta.
+    """
+    text = re.sub(r'<!--(?!\[).*?-->', '', text, flags=re.S)
+    text = re.sub(r'[ \t]*\n\s*', '\n', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    tags = '|'.join(BLOCK_TAGS)
+    text = re.sub(rf' ?(</?(?:{tags})\b[^>]*>) ?', r'\1', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip() + '\n'
+
+def page_inputs(name, page, sources, zips):
+    """Todo lo que influye en una página, para decidir si hay que regenerarla"""
+    return {
+        'pagina': page,
+        'canciones': sources['playlists'].get(page['playlist'], []),
+        'archivos': sources['downloads'].get(page['categoria']),
+        'spotify': sources['spotify'].get(page['categoria']),
+        'zips': zips,
+        'miniaturas': Image is not None,
+    }
+
+def inputs_hash(inputs, template):
+    sha = hashlib.sha256()
+    sha.update(template.encode('utf-8'))
+    sha.update(Path(__file__).read_bytes())
+    sha.update(json.dumps(inputs, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return sha.hexdigest()
+
+def build_page(page, inputs, template):
+    """Rellena la plantilla de una página"""
+    zips = inputs['zips']
+    sizes = [size for size in SIZES if size in zips]
+
+    downloads = ''.join(render_size_card(page, size, zips[size]) for size in sizes)
+    if 'todos' in zips and sizes:
+        downloads += render_pack_card(page, sizes, zips['todos'])
+
+    files = category_files(inputs['archivos'])
+    featured = sorted(files, key=lambda f: f.get('canciones') or 0, reverse=True)[:3]
+    empty = '<p style="text-align:center;color:var(--muted);">{}</p>'
+
+    spotify = {page['categoria']: inputs['spotify']} if inputs['spotify'] else {}
+    spotify_json = json.dumps(spotify, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+    return Template(template).substitute(
+        titulo=esc(page['titulo']),
+        descripcion=esc(page['descripcion']),
+        seo=render_seo(page),
+        color=page['color'],
+        color_rgb=hex_to_rgb(page['color']),
+        text_color=page['text_color'],
+        emoji=page['emoji'],
+        nombre=esc(page['nombre']),
+        lead=esc(page['lead']),
+        nombre_corto=esc(page['nombre_corto']),
+        subtitulo_png=esc(page['subtitulo_png']),
+        num_canciones=len(inputs['canciones']),
+        num_cartones=sum(zips[size]['cartones'] for size in sizes),
+        num_tamanos=len(sizes),
+        descargas=downloads,
+        canciones=''.join(f'<li>{esc(song)}</li>' for song in inputs['canciones']),
+        destacados=''.join(render_file_card(f) for f in featured) or empty.format('No hay cartones destacados'),
+        archivos=''.join(render_file_card(f) for f in files) or empty.format('No hay cartones disponibles'),
+        spotify=spotify_json,
+        categoria=esc(page['categoria']),
+    )
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description='Genera las páginas HTML de categoría')
+    parser.add_argument('paginas', nargs='*', help='Páginas a generar (por defecto, todas)')
+    parser.add_argument('--forzar', action='store_true', help='Regenera aunque no haya cambios')
+    args = parser.parse_args()
+
+    print('🏗️  Generando páginas de categoría')
+    print('=' * 60)
+    if Image is None:
+        print('⚠️  Pillow no está instalado: las páginas se generan sin miniaturas')
+
+    pages = load_json('category-pages.json')
+    sources = {
+        'playlists': load_json('playlists.json'),
+        'downloads': load_json('downloadable-cards.json'),
+        'spotify': load_json('spotify-playlists.json'),
+    }
+    template = TEMPLATE_PATH.read_text(encoding='utf-8')
+    state = json.loads(BUILD_STATE_PATH.read_text(encoding='utf-8')) if BUILD_STATE_PATH.exists() else {}
+
+    built = 0
+    for name, page in pages.items():
+        if args.paginas and name not in args.paginas:
+            continue
+        page = dict(page, archivo=f'{name}.html')
+        output_path = BASE_DIR / page['archivo']
+
+        zips = collect_zips(page['carpeta'])
+        inputs = page_inputs(name, page, sources, zips)
+        digest = inputs_hash(inputs, template)
+
+        if not args.forzar and state.get(name) == digest and output_path.exists():
+            print(f'   ⏭️  {page["archivo"]} (sin cambios)')
+            continue
+
+        if page['playlist'] not in sources['playlists']:
+            print(f'   ⚠️  {page["archivo"]}: no hay playlist "{page["playlist"]}" en playlists.json')
+
+        content = minify_html(build_page(page, inputs, template))
+        with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(content)
+        state[name] = digest
+        built += 1
+        print(f'   ✅ {page["archivo"]} ({len(content.encode("utf-8")) / 1024:.1f} KB)')
+
+    with open(BUILD_STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    print('=' * 60)
+    print(f'✅ {built} páginas generadas')
+
+if __name__ == '__main__':
+    main()
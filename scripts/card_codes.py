@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Códigos de cartón autoverificables para Bingo Musical
+Cada cartón lleva un código corto que contiene la categoría, la versión del
+catálogo, su número, los IDs de sus canciones y un checksum. Para comprobar
+un "¡Bingo!" basta con decodificar el código y compararlo con las canciones
+cantadas: no hace falta buscar el cartón en ningún fichero.
+
+Los IDs son las posiciones (desde 0) de las canciones en el listado de la
+categoría, el mismo orden que data/playlists.json y listado-canciones-*.md.
+
+Uso como verificador:
+    python scripts/card_codes.py --categoria "Navidad"
+    python scripts/card_codes.py --listado pedidos/00001-boda/catalogo.json
+    (se introducen los números cantados y luego los códigos a comprobar)
+
+Con --listado el catálogo sale de un listado-canciones-*.md o del
+catalogo.json de un pedido (order-queue.py), para cartones cuyas canciones
+no están en data/playlists.json.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+FORMAT_VERSION = 1
+CHECKSUM_BYTES = 3
+
+# Base32 de Crockford: sin I, L, O ni U para que se pueda dictar sin errores
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+DECODE_MAP = {c: i for i, c in enumerate(ALPHABET)}
+DECODE_MAP.update({'O': 0, 'I': 1, 'L': 1})
+
+def _hash16(text):
+    """Hash estable de 16 bits"""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=2).digest(), 'big')
+
+def _checksum(data):
+    return hashlib.blake2b(data, digest_size=CHECKSUM_BYTES).digest()
+
+def normalize_category(name):
+    """Normaliza el nombre de categoría igual que generate-cards.py"""
+    return name.lower().replace(' ', '-').replace('ñ', 'n').replace('á', 'a').replace('é', 'e').replace('í', 'i').replace('ó', 'o').replace('ú', 'u')
+
+def catalog_stamp(category, songs):
+    """
+    Devuelve (categoría, versión de catálogo) como dos enteros de 16 bits.
+    La versión cambia en cuanto se añade, quita o reordena una canción.
+    """
+    return _hash16(normalize_category(category)), _hash16('\n'.join(songs))
+
+def _to_base32(data):
+    value = int.from_bytes(data, 'big')
+    length = -(-len(data) * 8 // 5)
+    chars = []
+    for _ in range(length):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+def _from_base32(text):
+    value = 0
+    for char in text:
+        if char not in DECODE_MAP:
+            raise ValueError(f'Carácter no válido en el código: {char!r}')
+        value = (value << 5) | DECODE_MAP[char]
+    length = len(text) * 5 // 8
+    if value >> (length * 8):
+        raise ValueError('Longitud de código no válida')
+    return value.to_bytes(length, 'big')
+
+def format_code(code, group=4):
+    """Separa el código en grupos para imprimirlo o dictarlo"""
+    return '-'.join(code[i:i + group] for i in range(0, len(code), group))
+
+def encode_card(category, songs, card_songs, numero):
+    """
+    Genera el código de un cartón.
+
+    Args:
+        category: Nombre de la categoría (como en playlists.json)
+        songs: Listado completo de la categoría, en orden
+        card_songs: Canciones impresas en el cartón
+        numero: Número del cartón
+
+    Returns:
+        Código en base32 (sin guiones)
+    """
+    index = {song: idx for idx, song in enumerate(songs)}
+    try:
+        ids = [index[song] for song in card_songs]
+    except KeyError as e:
+        raise ValueError(f'La canción {e.args[0]!r} no está en el listado de {category}') from None
+    return encode_ids(catalog_stamp(category, songs), ids, numero)
+
+def encode_ids(stamp, ids, numero):
+    """Empaqueta sello de catálogo, número e IDs en un código"""
+    cat_hash, version = stamp
+    width = max(max(ids, default=0).bit_length(), 1)
+    if len(ids) > 255 or width > 255:
+        raise ValueError('Demasiadas canciones para un código de cartón')
+
+    data = bytearray([FORMAT_VERSION])
+    data += cat_hash.to_bytes(2, 'big')
+    data += version.to_bytes(2, 'big')
+
+    # Número de cartón como varint (LEB128)
+    n = numero
+    while True:
+        byte = n & 0x7f
+        n >>= 7
+        data.append(byte | (0x80 if n else 0))
+        if not n:
+            break
+
+    data.append(width)
+    data.append(len(ids))
+
+    packed = 0
+    for song_id in ids:
+        packed = (packed << width) | song_id
+    packed_len = -(-len(ids) * width // 8)
+    packed <<= packed_len * 8 - len(ids) * width
+    data += packed.to_bytes(packed_len, 'big')
+
+    data += _checksum(bytes(data))
+    return _to_base32(bytes(data))
+
+def decode_card(code):
+    """
+    Decodifica y valida un código de cartón.
+
+    Returns:
+        Diccionario con 'categoria', 'catalogo', 'numero', 'ids' y 'mascara'
+        (entero con un bit por canción del cartón)
+
+    Raises:
+        ValueError: si el código está mal escrito o el checksum no cuadra
+    """
+    text = code.strip().upper().replace('-', '').replace(' ', '')
+    data = _from_base32(text)
+    if len(data) < 9:
+        raise ValueError('Código demasiado corto')
+
+    body, checksum = data[:-CHECKSUM_BYTES], data[-CHECKSUM_BYTES:]
+    if _checksum(body) != checksum:
+        raise ValueError('Checksum incorrecto: el código está mal escrito')
+    if body[0] != FORMAT_VERSION:
+        raise ValueError(f'Versión de código no soportada: {body[0]}')
+
+    cat_hash = int.from_bytes(body[1:3], 'big')
+    version = int.from_bytes(body[3:5], 'big')
+
+    pos = 5
+    numero = 0
+    shift = 0
+    while True:
+        byte = body[pos]
+        pos += 1
+        numero |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            break
+
+    width, count = body[pos], body[pos + 1]
+    pos += 2
+    packed_bytes = body[pos:]
+    if len(packed_bytes) != -(-count * width // 8):
+        raise ValueError('Código incompleto')
+
+    packed = int.from_bytes(packed_bytes, 'big') >> (len(packed_bytes) * 8 - count * width)
+    ids = []
+    mask = 0
+    id_mask = (1 << width) - 1
+    for i in range(count):
+        song_id = (packed >> ((count - 1 - i) * width)) & id_mask
+        ids.append(song_id)
+        mask |= 1 << song_id
+
+    return {
+        'categoria': cat_hash,
+        'catalogo': version,
+        'numero': numero,
+        'ids': ids,
+        'mascara': mask,
+    }
+
+def called_mask(called_ids):
+    """Convierte los IDs de canciones cantadas en una máscara de bits"""
+    mask = 0
+    for song_id in called_ids:
+        mask |= 1 << song_id
+    return mask
+
+def verify_claim(code, called, stamp):
+    """
+    Comprueba un "¡Bingo!" (cartón completo).
+
+    Args:
+        code: Código impreso en el cartón
+        called: Máscara de canciones cantadas (ver called_mask)
+        stamp: Sello de la partida en juego (ver catalog_stamp)
+
+    Returns:
+        Diccionario con 'valido', 'numero', 'faltan' (IDs no cantados) y 'motivo'
+    """
+    try:
+        card = decode_card(code)
+    except (ValueError, IndexError) as e:
+        return {'valido': False, 'numero': None, 'faltan': [], 'motivo': str(e) or 'Código no válido'}
+
+    if (card['categoria'], card['catalogo']) != tuple(stamp):
+        return {'valido': False, 'numero': card['numero'], 'faltan': [],
+                'motivo': 'El cartón es de otra categoría o de otra versión del listado'}
+
+    missing = card['mascara'] & ~called
+    if missing:
+        faltan = [i for i in card['ids'] if missing >> i & 1]
+        return {'valido': False, 'numero': card['numero'], 'faltan': faltan,
+                'motivo': f'Faltan {len(faltan)} canciones por cantar'}
+
+    return {'valido': True, 'numero': card['numero'], 'faltan': [], 'motivo': '¡Bingo correcto!'}
+
+def parse_song_numbers(text, num_songs):
+    """
+    Convierte "3, 7,12" (números del listado, desde 1) en IDs de canción.
+    Lanza ValueError si algún número no es válido o está fuera del listado.
+    """
+    ids = []
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f'"{part}" no es un número de canción')
+        number = int(part)
+        if not 1 <= number <= num_songs:
+            raise ValueError(f'La canción {number} no existe (el listado va de 1 a {num_songs})')
+        ids.append(number - 1)
+    return ids
+
+def load_category_songs(category):
+    """Lee el listado de una categoría desde data/playlists.json"""
+    playlists_path = Path(__file__).parent.parent / 'data' / 'playlists.json'
+    with open(playlists_path, 'r', encoding='utf-8') as f:
+        playlists = json.load(f)
+    if category not in playlists:
+        raise ValueError(f'Categoría desconocida: {category} (disponibles: {", ".join(playlists)})')
+    return playlists[category]
+
+def load_catalog_file(path):
+    """
+    Lee (categoría, canciones) de un catalogo.json de pedido o de un
+    listado-canciones-*.md (mismo formato que save_cards_to_markdown).
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if path.suffix.lower() == '.json':
+        data = json.loads(content)
+        if not isinstance(data, dict) or 'categoria' not in data or 'canciones' not in data:
+            raise ValueError(f'{path} no es un catálogo (faltan "categoria" o "canciones")')
+        return data['categoria'], data['canciones']
+
+    category = None
+    songs = []
+    for line in content.split('\n'):
+        line = line.strip()
+        header = re.match(r'^# Listado de Canciones - (.+) \([^)]*\)$', line)
+        if header:
+            category = header.group(1)
+        elif re.match(r'^\d+\.\s+', line):
+            songs.append(re.sub(r'^\d+\.\s+', '', line))
+    if category is None or not songs:
+        raise ValueError(f'{path} no es un listado de canciones')
+    return category, songs
+
+def main():
+    """Verificador interactivo de cartones"""
+    parser = argparse.ArgumentParser(description='Verifica códigos de cartón de Bingo Musical')
+    parser.add_argument('-c', '--categoria', help='Categoría de la partida (data/playlists.json)')
+    parser.add_argument('--listado',
+                        help='listado-canciones-*.md o catalogo.json de un pedido (en lugar de --categoria)')
+    parser.add_argument('--cantadas', default='',
+                        help='Números de canciones cantadas (1, 2, ... como en el listado), separados por comas')
+    parser.add_argument('codigos', nargs='*', help='Códigos a verificar (si no se indican, se leen de la entrada)')
+    args = parser.parse_args()
+    if bool(args.categoria) == bool(args.listado):
+        parser.error('indica --categoria o --listado (solo uno)')
+
+    try:
+        if args.listado:
+            category, songs = load_catalog_file(args.listado)
+        else:
+            category, songs = args.categoria, load_category_songs(args.categoria)
+    except (OSError, ValueError) as e:
+        print(f'❌ Error: {e}')
+        sys.exit(1)
+
+    stamp = catalog_stamp(category, songs)
+    try:
+        called = called_mask(parse_song_numbers(args.cantadas, len(songs)))
+    except ValueError as e:
+        print(f'❌ Error en --cantadas: {e}')
+        sys.exit(1)
+
+    print(f'🎵 Partida: {category} ({len(songs)} canciones, catálogo {stamp[1]:04X})')
+    print('   Escribe un código para verificarlo, o "+N" para marcar la canción N como cantada\n')
+
+    entries = args.codigos or sys.stdin
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        if entry.startswith('+'):
+            try:
+                called |= called_mask(parse_song_numbers(entry[1:], len(songs)))
+            except ValueError as e:
+                print(f'❌ {e}')
+            continue
+
+        result = verify_claim(entry, called, stamp)
+        if result['valido']:
+            print(f"✅ Cartón #{result['numero']}: {result['motivo']}")
+        else:
+            prefix = f"Cartón #{result['numero']}: " if result['numero'] is not None else ''
+            print(f"❌ {prefix}{result['motivo']}")
+            for song_id in result['faltan']:
+                print(f'   - {song_id + 1}. {songs[song_id]}')
+
+if __name__ == '__main__':
+    main()
@@ -34,10 +34,11 @@ def normalize_folder_name(name):
     """Normaliza nombre de carpeta"""
     return name.lower().replace(' ', '-').replace('ñ', 'n').replace('á', 'a').replace('é', 'e').replace('í', 'i').replace('ó', 'o').replace('ú', 'u')
 
-def save_cards_to_markdown(category, size, cards, songs):
-    """Guarda cartones en archivos Markdown"""
+def save_cards_to_markdown(category, size, cards, songs, output_dir=None):
+    """Guarda cartones en archivos Markdown (en cartones/ salvo que se indique output_dir)"""
     folder_name = normalize_folder_name(category)
-    base_path = Path(__file__).parent.parent / 'cartones' / folder_name
+    root = Path(output_dir) if output_dir else Path(__file__).parent.parent / 'cartones'
+    base_path = root / folder_name
     
     # Crear carpeta si no existe
     size_folder = base_path / size
@@ -70,9 +71,17 @@ def save_cards_to_markdown(category, size, cards, songs):
         f.write(cartones_content)
     print(f'✅ Guardado: {cartones_path}')
     
+    # Rutas del índice: relativas al repo para cartones/, reales para otras carpetas
+    if output_dir:
+        listado_ref = listado_path.as_posix()
+        cartones_ref = cartones_path.as_posix()
+    else:
+        listado_ref = f'cartones/{folder_name}/{size}/listado-canciones-{folder_name}-{size}.md'
+        cartones_ref = f'cartones/{folder_name}/{size}/cartones-{folder_name}-{size}.md'
+    
     return {
-        'listado': f'cartones/{folder_name}/{size}/listado-canciones-{folder_name}-{size}.md',
-        'cartones': f'cartones/{folder_name}/{size}/cartones-{folder_name}-{size}.md',
+        'listado': listado_ref,
+        'cartones': cartones_ref,
         'numCanciones': len(songs),
         'cancionesPorCarton': len(cards[0]),
         'numCartones': len(cards)
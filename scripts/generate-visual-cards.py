@@ -5,14 +5,35 @@
 Generador de Cartones Visuales de Bingo Musical
 Convierte cartones en formato Markdown a imágenes PNG con diseño profesional
 Formato: 4x4 (16 casillas) = 12 canciones + 4 comodines (1 por fila aleatoriamente)
+Idiomas: los textos del cartón salen de data/i18n.json y se generan todos en una pasada
 """
 
+import argparse
+import json
+import os
 import re
-import random
+import sys
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
-# Temas de colores por categoría
+from card_codes import encode_card, format_code
+from win_patterns import build_cells, get_layout, place_wildcards, winning_patterns
+
+try:
+    import qrcode
+except ImportError:
+    qrcode = None  # Sin QR: el código se imprime solo como texto
+
+# Textos de los cartones por idioma (sección "cards" de cada idioma)
+I18N_PATH = Path(__file__).parent.parent / 'data' / 'i18n.json'
+DEFAULT_LOCALE = 'es'
+
+# Medidas fijas del cartón
+HEADER_HEIGHT = 110
+GRID_MARGIN = 35
+
+# Temas de colores por categoría (los títulos están en data/i18n.json)
 CATEGORY_THEMES = {
     'navidad': {
         'bg_color': '#c41e3a',       # Rojo navideño
@@ -20,7 +41,6 @@ CATEGORY_THEMES = {
         'header_color': '#165b33',   # Verde navideño
         'text_color': '#2d3436',     # Texto oscuro
         'wildcard_emoji': '🎄',      # Árbol de Navidad
-        'title': 'BINGO Musical 🎄 Navidad'
     },
     'rock': {
         'bg_color': '#1a1a1a',       # Negro
@@ -28,7 +48,6 @@ CATEGORY_THEMES = {
         'header_color': '#8b0000',   # Rojo oscuro
         'text_color': '#2d3436',
         'wildcard_emoji': '🤘',      # Cuernos de rock
-        'title': 'BINGO Musical 🤘 Rock'
     },
     'pop-latino': {
         'bg_color': '#ff8c42',       # Naranja
@@ -36,7 +55,6 @@ CATEGORY_THEMES = {
         'header_color': '#d62828',   # Rojo latino
         'text_color': '#2d3436',
         'wildcard_emoji': '💃',      # Bailarina
-        'title': 'BINGO Musical 💃 Pop Latino'
     },
     'clasicos-pop': {
         'bg_color': '#ff6b9d',       # Rosa
@@ -44,7 +62,6 @@ CATEGORY_THEMES = {
         'header_color': '#c9184a',   # Rosa oscuro
         'text_color': '#2d3436',
         'wildcard_emoji': '🎸',      # Guitarra
-        'title': 'BINGO Musical 🎸 Clásicos Pop'
     },
     'cumpleanos': {
         'bg_color': '#ffd93d',       # Amarillo
@@ -52,7 +69,6 @@ CATEGORY_THEMES = {
         'header_color': '#f77f00',   # Naranja
         'text_color': '#2d3436',
         'wildcard_emoji': '🎂',      # Pastel
-        'title': 'BINGO Musical 🎂 Cumpleaños'
     },
     'otono': {
         'bg_color': '#d4a574',       # Marrón otoñal
@@ -60,7 +76,6 @@ CATEGORY_THEMES = {
         'header_color': '#8b4513',   # Marrón oscuro
         'text_color': '#2d3436',
         'wildcard_emoji': '🍂',      # Hoja
-        'title': 'BINGO Musical 🍂 Otoño'
     },
     'espanol': {
         'bg_color': '#e63946',       # Rojo español
@@ -68,7 +83,6 @@ CATEGORY_THEMES = {
         'header_color': '#a8201a',   # Rojo oscuro
         'text_color': '#2d3436',
         'wildcard_emoji': '🇪🇸',      # Bandera España
-        'title': 'BINGO Musical 🇪🇸 Español'
     },
     'ingles': {
         'bg_color': '#4361ee',       # Azul
@@ -76,7 +90,6 @@ CATEGORY_THEMES = {
         'header_color': '#3a0ca3',   # Azul oscuro
         'text_color': '#2d3436',
         'wildcard_emoji': '🇬🇧',      # Bandera UK
-        'title': 'BINGO Musical 🇬🇧 Inglés'
     },
     'default': {
         'bg_color': '#6366f1',       # Azul índigo
@@ -84,7 +97,6 @@ CATEGORY_THEMES = {
         'header_color': '#4338ca',   # Azul oscuro
         'text_color': '#2d3436',
         'wildcard_emoji': '⭐',      # Estrella
-        'title': 'BINGO Musical ⭐'
     }
 }
 
@@ -170,137 +182,129 @@ def parse_markdown_card(md_content):
     
     return cards
 
-def create_bingo_card_image(card_data, theme, output_path, size_type='medianos', card_size=(900, 1200)):
+def parse_listado(md_content):
     """
-    Crea una imagen de un cartón de bingo con diseño visual mejorado
-    Formatos:
-    - Pequeños: 3×4 = 12 canciones (sin comodines en última fila)
-    - Medianos: 4×4 = 12 canciones + 4 comodines (1 por fila)
-    - Grandes: 5×4 = 16 canciones + 4 comodines (1 por fila)
-    
-    Args:
-        card_data: Diccionario con 'numero' y 'songs' (lista de canciones)
-        theme: Diccionario con colores y configuración del tema
-        output_path: Ruta donde guardar la imagen
-        size_type: 'pequeños', 'medianos' o 'grandes'
-        card_size: Tupla (ancho, alto) del tamaño de la imagen
+    Parsea un listado-canciones-*.md y devuelve (categoría, canciones).
+    El orden de las canciones define sus IDs en los códigos de cartón.
     """
-    img = Image.new('RGB', card_size, theme['bg_color'])
-    draw = ImageDraw.Draw(img)
-    
-    # Configuración de fuentes (tamaños ajustados)
+    category = None
+    songs = []
+    for line in md_content.split('\n'):
+        line = line.strip()
+        match = re.match(r'^# Listado de Canciones - (.+) \(.+\)$', line)
+        if match:
+            category = match.group(1)
+        elif re.match(r'^\d+\.\s+', line):
+            songs.append(re.sub(r'^\d+\.\s+', '', line))
+    return category, songs
+
+def load_catalog(md_file_path):
+    """
+    Busca el listado que acompaña a un archivo de cartones
+    (cartones-X.md → listado-canciones-X.md). Devuelve None si no existe.
+    """
+    listado_path = md_file_path.with_name(md_file_path.name.replace('cartones-', 'listado-canciones-', 1))
+    if not listado_path.exists():
+        return None
+    with open(listado_path, 'r', encoding='utf-8') as f:
+        category, songs = parse_listado(f.read())
+    if not category or not songs:
+        return None
+    return category, songs
+
+@lru_cache(maxsize=None)
+def load_i18n():
+    """Carga data/i18n.json (textos de la web y de los cartones)"""
+    with open(I18N_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def available_locales():
+    """Idiomas que tienen textos de cartón ('cards') en i18n.json"""
+    return [locale for locale, texts in load_i18n().items() if 'cards' in texts]
+
+def card_texts(locale):
+    """Textos del cartón en un idioma; lo que falte se toma del español"""
+    i18n = load_i18n()
+    default = i18n[DEFAULT_LOCALE]['cards']
+    localized = i18n.get(locale, {}).get('cards', {})
+    texts = {**default, **localized}
+    texts['themes'] = {**default['themes'], **localized.get('themes', {})}
+    return texts
+
+def card_title(theme, category, texts):
+    """Título del cartón, p. ej. 'BINGO Musical 🎄 Navidad'"""
+    if theme.get('title'):
+        return theme['title']  # Título propio (pedidos personalizados)
+    title = f"{texts['title']} {theme['wildcard_emoji']}"
+    name = texts['themes'].get(category)
+    return f"{title} {name}" if name else title
+
+@lru_cache(maxsize=None)
+def load_fonts():
+    """Fuentes del cartón (tamaños ajustados); se cargan una sola vez"""
     try:
-        font_title = ImageFont.truetype("arial.ttf", 42)
-        font_song = ImageFont.truetype("arial.ttf", 13)  # Más pequeño para más texto
-        font_emoji = ImageFont.truetype("seguiemj.ttf", 45)  # Ajustado para grids
-        font_footer = ImageFont.truetype("arial.ttf", 17)  # 3 puntos más grande (14→17)
+        return {
+            'title': ImageFont.truetype("arial.ttf", 42),
+            'song': ImageFont.truetype("arial.ttf", 13),  # Más pequeño para más texto
+            'emoji': ImageFont.truetype("seguiemj.ttf", 45),  # Ajustado para grids
+            'footer': ImageFont.truetype("arial.ttf", 17),  # 3 puntos más grande (14→17)
+        }
     except:
-        font_title = ImageFont.load_default()
-        font_song = ImageFont.load_default()
-        font_emoji = ImageFont.load_default()
-        font_footer = ImageFont.load_default()
-    
-    # Header con gradiente visual
-    header_height = 110
-    
-    # Fondo del header con efecto degradado simulado
-    for i in range(header_height):
-        alpha = int(255 * (1 - i / header_height * 0.3))
-        color = theme['header_color']
-        draw.rectangle([(0, i), (card_size[0], i+1)], fill=color)
-    
-    # Título
-    title = theme['title']
-    card_number = f"Cartón #{card_data['numero']}"
-    
-    # Dibujar título con sombra
-    title_bbox = draw.textbbox((0, 0), title, font=font_title)
-    title_width = title_bbox[2] - title_bbox[0]
-    title_x = (card_size[0] - title_width) // 2
-    
-    # Sombra del título
-    draw.text((title_x + 2, 22), title, fill='#00000040', font=font_title)
-    # Título
-    draw.text((title_x, 20), title, fill='#ffffff', font=font_title)
-    
-    # Número de cartón
-    number_bbox = draw.textbbox((0, 0), card_number, font=font_footer)
-    number_width = number_bbox[2] - number_bbox[0]
-    draw.text(((card_size[0] - number_width) // 2, 70), card_number, fill='#ffffffcc', font=font_footer)
-    
-    # Grid de canciones (configuración según tamaño)
-    margin = 35
-    grid_top = header_height + 35
-    grid_width = card_size[0] - (2 * margin)
+        default = ImageFont.load_default()
+        return {'title': default, 'song': default, 'emoji': default, 'footer': default}
+
+@lru_cache(maxsize=None)
+def cell_boxes(size_type, card_size):
+    """
+    Posición (x, y, ancho, alto) de cada casilla, en orden de lectura.
+    Filas y columnas según LAYOUTS en win_patterns.py:
+    - Pequeños: 3×4 = 8 canciones + 4 casillas vacías (sin comodines)
+    - Medianos: 4×4 = 16 casillas (12 canciones + 4 comodines)
+    - Grandes: 5×4 = 20 casillas (15 canciones + 5 comodines)
+    """
+    grid_top = HEADER_HEIGHT + 35
+    grid_width = card_size[0] - (2 * GRID_MARGIN)
     grid_height = card_size[1] - grid_top - 90
     
-    # Configuración según tamaño del cartón
-    if size_type == 'pequeños':
-        # Pequeños: 3×4 = 12 canciones (sin comodines)
-        cols = 4
-        rows = 3
-        num_songs = 12
-        use_wildcards = False
-    elif size_type == 'grandes':
-        # Grandes: 5×4 = 20 casillas (16 canciones + 4 comodines)
-        cols = 4
-        rows = 5
-        num_songs = 16
-        use_wildcards = True
-    else:  # medianos
-        # Medianos: 4×4 = 16 casillas (12 canciones + 4 comodines)
-        cols = 4
-        rows = 4
-        num_songs = 12
-        use_wildcards = True
-    
+    layout = get_layout(size_type)
+    cols = layout['cols']
+    rows = layout['rows']
     cell_width = grid_width // cols
     cell_height = grid_height // rows
     
-    # Preparar casillas según configuración
-    cells = []
-    songs_copy = card_data['songs'][:num_songs]
-    song_idx = 0
+    boxes = []
+    for idx in range(rows * cols):
+        row = idx // cols
+        col = idx % cols
+        x = GRID_MARGIN + (col * cell_width) + 6
+        y = grid_top + (row * cell_height) + 6
+        boxes.append((x, y, cell_width - 12, cell_height - 12))
+    return tuple(boxes)
+
+# Plantillas ya dibujadas: (colores, tamaño, dimensiones) → imagen
+_TEMPLATES = {}
+
+def card_template(theme, size_type, card_size):
+    """
+    Fondo del cartón sin textos: header, marcos de las casillas y línea del
+    footer. Solo depende de los colores y del formato, así que se dibuja una
+    vez y cada cartón parte de una copia.
+    """
+    key = (theme['bg_color'], theme['header_color'], theme['card_bg'], size_type, card_size)
+    if key in _TEMPLATES:
+        return _TEMPLATES[key]
+    
+    img = Image.new('RGB', card_size, theme['bg_color'])
+    draw = ImageDraw.Draw(img)
     
-    if use_wildcards:
-        # Con comodines: 1 por fila en posición aleatoria
-        for row_num in range(rows):
-            row_cells = []
-            wildcard_col = random.randint(0, cols - 1)
-            
-            for col_num in range(cols):
-                if col_num == wildcard_col:
-                    row_cells.append('COMODÍN')
-                else:
-                    if song_idx < len(songs_copy):
-                        row_cells.append(songs_copy[song_idx])
-                        song_idx += 1
-                    else:
-                        row_cells.append('COMODÍN')
-            
-            cells.extend(row_cells)
-    else:
-        # Sin comodines: solo canciones
-        for i in range(cols * rows):
-            if song_idx < len(songs_copy):
-                cells.append(songs_copy[song_idx])
-                song_idx += 1
-            else:
-                cells.append('')  # Celda vacía si faltan canciones
+    # Fondo del header con efecto degradado simulado
+    for i in range(HEADER_HEIGHT):
+        draw.rectangle([(0, i), (card_size[0], i+1)], fill=theme['header_color'])
     
     # Radio de bordes redondeados
     corner_radius = 8
     
-    # Dibujar las celdas con diseño mejorado
-    for idx, song in enumerate(cells):
-        row = idx // cols
-        col = idx % cols
-        
-        x = margin + (col * cell_width) + 6
-        y = grid_top + (row * cell_height) + 6
-        cell_w = cell_width - 12
-        cell_h = cell_height - 12
-        
+    for x, y, cell_w, cell_h in cell_boxes(size_type, card_size):
         # Sombra sutil
         shadow_offset = 4
         # Simular borde redondeado en sombra
@@ -322,89 +326,92 @@ def create_bingo_card_image(card_data, theme, output_path, size_type='medianos',
             width=3,
             fill=theme['card_bg']
         )
-        
+    
+    # Línea decorativa superior del footer
+    line_y = card_size[1] - 50 - 15
+    draw.line([(GRID_MARGIN, line_y), (card_size[0] - GRID_MARGIN, line_y)], 
+              fill=theme['header_color'], width=3)
+    
+    _TEMPLATES[key] = img
+    return img
+
+def wrap_words(text, max_chars):
+    """Divide un texto por palabras en líneas de max_chars como mucho"""
+    lines = []
+    current_line = ''
+    for word in text.split():
+        test_line = current_line + (' ' if current_line else '') + word
+        if len(test_line) <= max_chars:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+@lru_cache(maxsize=4096)
+def song_lines(song, max_chars_per_line=22):
+    """
+    Líneas de texto de una casilla: la canción y el artista por separado
+    (formato "Canción - Artista"), partidos por palabras. Máximo 5 líneas.
+    """
+    words = song.split(' - ')
+    parts = [words[0].strip(), words[1].strip()] if len(words) >= 2 else [song]
+    
+    lines = []
+    for part in parts:
+        if len(part) > max_chars_per_line:
+            lines.extend(wrap_words(part, max_chars_per_line))
+        else:
+            lines.append(part)
+    
+    if len(lines) > 5:
+        lines = lines[:5]
+        lines[-1] = lines[-1][:19] + '...'
+    return tuple(lines)
+
+def render_card(card_data, theme, size_type='medianos', card_size=(900, 1200), catalog=None):
+    """
+    Dibuja la parte del cartón que no depende del idioma: plantilla,
+    canciones, comodines, código de verificación y QR.
+    
+    Returns:
+        Imagen PIL sin título, número de cartón ni footer
+    """
+    img = card_template(theme, size_type, card_size).copy()
+    draw = ImageDraw.Draw(img)
+    fonts = load_fonts()
+    
+    # Preparar casillas: 1 comodín por fila en posición aleatoria.
+    # La máscara se guarda en el cartón para poder comprobar jugadas después.
+    if 'comodines' not in card_data:
+        card_data['comodines'] = place_wildcards(size_type)
+    cells, free_mask = build_cells(card_data['songs'], size_type, card_data['comodines'])
+    card_data['libres'] = free_mask
+    
+    # Canciones que se imprimen de verdad: son las que codifica el código del cartón
+    drawn_songs = []
+    
+    for song, (x, y, cell_w, cell_h) in zip(cells, cell_boxes(size_type, card_size)):
         # Verificar si es un comodín
         is_wildcard = 'COMODÍN' in song.upper() or song.strip() == ''
         
         if is_wildcard:
             # Dibujar emoji centrado
             emoji = theme['wildcard_emoji']
-            emoji_bbox = draw.textbbox((0, 0), emoji, font=font_emoji)
+            emoji_bbox = draw.textbbox((0, 0), emoji, font=fonts['emoji'])
             emoji_width = emoji_bbox[2] - emoji_bbox[0]
             emoji_height = emoji_bbox[3] - emoji_bbox[1]
             
             emoji_x = x + (cell_w - emoji_width) // 2
             emoji_y = y + (cell_h - emoji_height) // 2
             
-            draw.text((emoji_x, emoji_y), emoji, font=font_emoji, embedded_color=True)
+            draw.text((emoji_x, emoji_y), emoji, font=fonts['emoji'], embedded_color=True)
         else:
-            # Dibujar texto de la canción con mejor ajuste
-            max_chars_per_line = 22
-            words = song.split(' - ')
-            
-            # Separar en líneas
-            lines = []
-            if len(words) >= 2:
-                # Tiene formato "Canción - Artista"
-                song_part = words[0].strip()
-                artist_part = words[1].strip()
-                
-                # Dividir canción en múltiples líneas si es necesario
-                if len(song_part) > max_chars_per_line:
-                    # Intentar dividir por palabras
-                    song_words = song_part.split()
-                    current_line = ''
-                    for word in song_words:
-                        test_line = current_line + (' ' if current_line else '') + word
-                        if len(test_line) <= max_chars_per_line:
-                            current_line = test_line
-                        else:
-                            if current_line:
-                                lines.append(current_line)
-                            current_line = word
-                    if current_line:
-                        lines.append(current_line)
-                else:
-                    lines.append(song_part)
-                
-                # Añadir artista
-                if len(artist_part) > max_chars_per_line:
-                    artist_words = artist_part.split()
-                    current_line = ''
-                    for word in artist_words:
-                        test_line = current_line + (' ' if current_line else '') + word
-                        if len(test_line) <= max_chars_per_line:
-                            current_line = test_line
-                        else:
-                            if current_line:
-                                lines.append(current_line)
-                            current_line = word
-                    if current_line:
-                        lines.append(current_line)
-                else:
-                    lines.append(artist_part)
-            else:
-                # Sin separador, dividir por palabras
-                if len(song) > max_chars_per_line:
-                    song_words = song.split()
-                    current_line = ''
-                    for word in song_words:
-                        test_line = current_line + (' ' if current_line else '') + word
-                        if len(test_line) <= max_chars_per_line:
-                            current_line = test_line
-                        else:
-                            if current_line:
-                                lines.append(current_line)
-                            current_line = word
-                    if current_line:
-                        lines.append(current_line)
-                else:
-                    lines.append(song)
-            
-            # Limitar a máximo 5 líneas
-            if len(lines) > 5:
-                lines = lines[:5]
-                lines[-1] = lines[-1][:19] + '...'
+            drawn_songs.append(song)
+            lines = song_lines(song)
             
             # Calcular posición vertical centrada
             line_height = 15
@@ -413,34 +420,118 @@ def create_bingo_card_image(card_data, theme, output_path, size_type='medianos',
             
             # Dibujar cada línea centrada
             for line_idx, line in enumerate(lines):
-                text_bbox = draw.textbbox((0, 0), line, font=font_song)
+                text_bbox = draw.textbbox((0, 0), line, font=fonts['song'])
                 text_width = text_bbox[2] - text_bbox[0]
                 text_x = x + (cell_w - text_width) // 2
                 text_y = text_start_y + (line_idx * line_height)
                 
-                draw.text((text_x, text_y), line, fill=theme['text_color'], font=font_song)
+                draw.text((text_x, text_y), line, fill=theme['text_color'], font=fonts['song'])
     
-    # Footer con línea decorativa
-    footer_y = card_size[1] - 50
+    # Código de verificación (texto en el footer + QR en el header)
+    if catalog:
+        category, songs = catalog
+        card_code = encode_card(category, songs, drawn_songs, card_data['numero'])
+        
+        code_text = format_code(card_code)
+        code_bbox = draw.textbbox((0, 0), code_text, font=fonts['song'])
+        code_width = code_bbox[2] - code_bbox[0]
+        draw.text(((card_size[0] - code_width) // 2, card_size[1] - 50 + 24),
+                  code_text, fill=theme['text_color'], font=fonts['song'])
+        
+        if qrcode:
+            qr = qrcode.QRCode(border=1, box_size=3, error_correction=qrcode.constants.ERROR_CORRECT_M)
+            qr.add_data(card_code)
+            qr.make(fit=True)
+            qr_img = qr.make_image(fill_color='black', back_color='white').convert('RGB')
+            qr_side = HEADER_HEIGHT - 20
+            qr_img = qr_img.resize((qr_side, qr_side), Image.NEAREST)
+            img.paste(qr_img, (card_size[0] - qr_side - 10, 10))
+    
+    return img
+
+def draw_card_texts(img, theme, category, texts, numero, card_size=(900, 1200)):
+    """Dibuja los textos que dependen del idioma: título, número de cartón y footer"""
+    draw = ImageDraw.Draw(img)
+    fonts = load_fonts()
     
-    # Línea decorativa superior
-    line_y = footer_y - 15
-    draw.line([(margin, line_y), (card_size[0] - margin, line_y)], 
-              fill=theme['header_color'], width=3)
+    # Título con sombra
+    title = card_title(theme, category, texts)
+    title_bbox = draw.textbbox((0, 0), title, font=fonts['title'])
+    title_width = title_bbox[2] - title_bbox[0]
+    title_x = (card_size[0] - title_width) // 2
+    draw.text((title_x + 2, 22), title, fill='#00000040', font=fonts['title'])
+    draw.text((title_x, 20), title, fill='#ffffff', font=fonts['title'])
+    
+    # Número de cartón
+    card_number = texts['cardNumber'].format(numero=numero)
+    number_bbox = draw.textbbox((0, 0), card_number, font=fonts['footer'])
+    number_width = number_bbox[2] - number_bbox[0]
+    draw.text(((card_size[0] - number_width) // 2, 70), card_number, fill='#ffffffcc', font=fonts['footer'])
     
     # Texto del footer
-    footer_text = "bingomusicalgratis.es"
-    footer_bbox = draw.textbbox((0, 0), footer_text, font=font_footer)
+    footer_y = card_size[1] - 50
+    footer_text = texts['footer']
+    footer_bbox = draw.textbbox((0, 0), footer_text, font=fonts['footer'])
     footer_width = footer_bbox[2] - footer_bbox[0]
     draw.text(((card_size[0] - footer_width) // 2, footer_y), 
-              footer_text, fill=theme['text_color'], font=font_footer)
+              footer_text, fill=theme['text_color'], font=fonts['footer'])
+
+def save_png(img, output_path):
+    """
+    Guarda la imagen en un temporal y lo renombra. Nunca se escribe dentro del
+    fichero existente: puede ser un enlace duro a un blob de artifact-store.py.
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    img.save(tmp_path, 'PNG', optimize=True)
+    os.replace(tmp_path, output_path)
+
+def create_localized_card_images(card_data, theme, output_paths, size_type='medianos', card_size=(900, 1200),
+                                 catalog=None, category='default'):
+    """
+    Crea el mismo cartón en varios idiomas de una pasada. Las casillas, el
+    código y el QR se dibujan una sola vez; cada idioma parte de una copia y
+    solo añade sus textos.
     
-    # Guardar imagen
-    img.save(output_path, 'PNG', optimize=True)
+    Args:
+        output_paths: Diccionario {idioma: ruta de la imagen}
+        Resto: como en create_bingo_card_image()
+    """
+    base = render_card(card_data, theme, size_type, card_size, catalog)
+    for locale, output_path in output_paths.items():
+        img = base.copy() if len(output_paths) > 1 else base
+        draw_card_texts(img, theme, category, card_texts(locale), card_data['numero'], card_size)
+        save_png(img, output_path)
 
-def process_markdown_file(md_file_path, output_base_dir):
+def create_bingo_card_image(card_data, theme, output_path, size_type='medianos', card_size=(900, 1200), catalog=None,
+                            category='default', locale=DEFAULT_LOCALE):
     """
-    Procesa un archivo Markdown y genera las imágenes PNG para todos sus cartones
+    Crea una imagen de un cartón de bingo con diseño visual mejorado
+    Formatos:
+    - Pequeños: 3×4 = 8 canciones (sin comodines; la última fila queda vacía)
+    - Medianos: 4×4 = 12 canciones + 4 comodines (1 por fila)
+    - Grandes: 5×4 = 15 canciones + 5 comodines (1 por fila)
+    
+    Args:
+        card_data: Diccionario con 'numero' y 'songs' (lista de canciones); opcionalmente
+            'comodines' (máscara de casillas comodín). Se añaden 'comodines' y 'libres'
+        theme: Diccionario con colores y configuración del tema
+        output_path: Ruta donde guardar la imagen
+        size_type: 'pequeños', 'medianos' o 'grandes'
+        card_size: Tupla (ancho, alto) del tamaño de la imagen
+        catalog: Tupla (categoría, canciones) del listado; si se indica, se
+            imprime el código de verificación del cartón (texto + QR)
+        category: Clave de CATEGORY_THEMES (nombre del tema en el título)
+        locale: Idioma de los textos ('es', 'ca', 'en'... según data/i18n.json)
+    """
+    create_localized_card_images(card_data, theme, {locale: output_path}, size_type, card_size,
+                                 catalog=catalog, category=category)
+
+def process_markdown_file(md_file_path, output_base_dir, locales=(DEFAULT_LOCALE,)):
+    """
+    Procesa un archivo Markdown y genera las imágenes PNG para todos sus cartones,
+    en todos los idiomas indicados. Las imágenes en español van a
+    {output_base_dir}/{categoría}/ y las demás a {output_base_dir}/{idioma}/{categoría}/
     """
     try:
         # Leer archivo
@@ -458,25 +549,58 @@ def process_markdown_file(md_file_path, output_base_dir):
         category = detect_category(md_file_path)
         theme = CATEGORY_THEMES[category]
         size_type = detect_card_size(md_file_path)
+        catalog = load_catalog(md_file_path)
+        if catalog is None:
+            print(f"⚠️  Sin listado para {md_file_path}: los cartones no llevarán código")
         
-        # Crear directorio de salida
+        # Crear directorios de salida (uno por idioma)
         output_dir = output_base_dir / category
         output_dir.mkdir(parents=True, exist_ok=True)
+        locale_dirs = {}
+        for locale in locales:
+            locale_dirs[locale] = output_dir if locale == DEFAULT_LOCALE else output_base_dir / locale / category
+            locale_dirs[locale].mkdir(parents=True, exist_ok=True)
         
         # Obtener nombre base del archivo
         file_stem = md_file_path.stem  # nombre sin extensión
         
+        # Máscaras de comodines de cada cartón (se reutilizan si ya existen
+        # para que regenerar las imágenes no mueva los comodines)
+        layout_path = output_dir / f"{file_stem}-comodines.json"
+        saved_masks = {}
+        if layout_path.exists():
+            with open(layout_path, 'r', encoding='utf-8') as f:
+                saved_layout = json.load(f)
+            if saved_layout.get('tamaño') == size_type:
+                saved_masks = saved_layout.get('cartones', {})
+        
         # Generar imágenes
         generated_count = 0
         for card in cards:
-            # Nombre de archivo de salida
+            saved = saved_masks.get(str(card['numero']))
+            # Los comodines guardados que completan una jugada se vuelven a sortear
+            if saved and not winning_patterns(saved['comodines'], size_type):
+                card['comodines'] = saved['comodines']
+            
+            # Nombre de archivo de salida (igual en todos los idiomas)
             output_filename = f"{file_stem}-carton-{card['numero']:03d}.png"
-            output_path = output_dir / output_filename
+            output_paths = {locale: folder / output_filename for locale, folder in locale_dirs.items()}
             
-            # Generar imagen con tamaño específico
-            create_bingo_card_image(card, theme, output_path, size_type=size_type)
-            print(f"✅ Generada: {output_path}")
-            generated_count += 1
+            # Generar imágenes con tamaño específico: las casillas se dibujan una vez para todos los idiomas
+            create_localized_card_images(card, theme, output_paths, size_type=size_type,
+                                         catalog=catalog, category=category)
+            for output_path in output_paths.values():
+                print(f"✅ Generada: {output_path}")
+                generated_count += 1
+        
+        with open(layout_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'tamaño': size_type,
+                'cartones': {
+                    str(card['numero']): {'comodines': card['comodines'], 'libres': card['libres']}
+                    for card in cards
+                }
+            }, f, ensure_ascii=False, indent=2)
         
         return generated_count
         
@@ -488,6 +612,19 @@ def main():
     """
     Función principal que escanea el directorio de cartones y genera las imágenes
     """
+    parser = argparse.ArgumentParser(description='Genera los cartones visuales PNG')
+    parser.add_argument('--idiomas', help='Idiomas separados por comas (por defecto, todos los de data/i18n.json)')
+    args = parser.parse_args()
+    
+    locales = available_locales()
+    if args.idiomas:
+        requested = [locale.strip() for locale in args.idiomas.split(',') if locale.strip()]
+        unknown = [locale for locale in requested if locale not in locales]
+        if unknown:
+            print(f"❌ Idiomas sin textos de cartón en i18n.json: {', '.join(unknown)}")
+            sys.exit(1)
+        locales = requested
+    
     print("🎨 Generador de Cartones Visuales de Bingo Musical")
     print("=" * 60)
     
@@ -498,6 +635,7 @@ def main():
     
     print(f"📁 Buscando cartones en: {cartones_dir}")
     print(f"💾 Guardando imágenes en: {output_dir}")
+    print(f"🌐 Idiomas: {', '.join(locales)}")
     print("=" * 60)
     
     # Buscar todos los archivos de cartones, excluyendo "varios"
@@ -515,7 +653,7 @@ def main():
     total_generated = 0
     for md_file in md_files:
         print(f"📄 Procesando: {md_file}")
-        count = process_markdown_file(md_file, output_dir)
+        count = process_markdown_file(md_file, output_dir, locales)
         if count > 0:
             print(f"   Encontrados {count} cartones\n")
         total_generated += count
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Importador masivo de playlists para Bingo Musical
+Lee exportaciones locales (CSV, M3U/M3U8, JSON de Spotify) línea a línea,
+normaliza cada canción a "Título - Artista" y la añade a data/playlists.json
+sin duplicados entre categorías.
+
+Los ficheros se procesan en streaming: nunca se cargan enteros en memoria,
+por lo que sirven exportaciones con millones de filas. El catálogo sí se
+carga entero (hay que reescribir playlists.json), así que la memoria crece
+con las canciones del catálogo y las nuevas, no con el tamaño del fichero.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+PLAYLISTS_PATH = Path(__file__).parent.parent / 'data' / 'playlists.json'
+
+# Cabeceras reconocidas en CSV (Exportify, Soundiiz, TuneMyMusic, hojas propias...)
+TITLE_COLUMNS = ('title', 'track', 'track name', 'trackname', 'song', 'name',
+                 'titulo', 'título', 'cancion', 'canción', 'nombre')
+ARTIST_COLUMNS = ('artist', 'artists', 'artist name', 'artist name(s)', 'artistname',
+                  'artista', 'artistas', 'interprete', 'intérprete')
+
+# Claves de título y artista en objetos JSON propios (además de los formatos de Spotify)
+JSON_TITLE_KEYS = ('title', 'track', 'titulo', 'título')
+JSON_ARTIST_KEYS = ('artist', 'artista')
+
+# Tamaño de bloque para leer JSON en streaming
+CHUNK_SIZE = 64 * 1024
+
+def load_playlists(path=PLAYLISTS_PATH):
+    """Carga el catálogo actual (si existe)"""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def clean_text(text):
+    """Colapsa espacios y saltos de línea"""
+    return re.sub(r'\s+', ' ', str(text or '')).strip()
+
+def format_song(title, artist):
+    """Normaliza una canción al formato del catálogo: "Título - Artista" """
+    title = clean_text(title)
+    artist = clean_text(artist)
+    if not title:
+        return None
+    return f'{title} - {artist}' if artist else title
+
+def song_key(song):
+    """
+    Clave de deduplicación: sin tildes, sin mayúsculas, espacios colapsados.
+    Se guarda como hash de 64 bits para que el conjunto ocupe poco aunque
+    haya millones de canciones distintas.
+    """
+    text = unicodedata.normalize('NFKD', song.casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r'\s+', ' ', text).strip()
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def iter_csv(path):
+    """Genera canciones de un CSV, detectando las columnas de título y artista"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [h.strip().lower() for h in header]
+        title_idx = next((columns.index(c) for c in TITLE_COLUMNS if c in columns), None)
+        artist_idx = next((columns.index(c) for c in ARTIST_COLUMNS if c in columns), None)
+
+        if title_idx is None:
+            # Sin cabecera reconocible: la primera columna ya es "Título - Artista"
+            song = format_song(header[0], '') if header else None
+            if song:
+                yield song
+            title_idx = 0
+
+        for row in reader:
+            if len(row) <= title_idx:
+                continue
+            artist = row[artist_idx] if artist_idx is not None and len(row) > artist_idx else ''
+            song = format_song(row[title_idx], artist)
+            if song:
+                yield song
+
+def iter_m3u(path):
+    """
+    Genera canciones de una lista M3U/M3U8.
+    Usa la etiqueta #EXTINF ("Artista - Título") o, si falta, el nombre del fichero.
+    """
+    extinf = None
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('#EXTINF'):
+                extinf = line.split(',', 1)[1] if ',' in line else None
+                continue
+            if line.startswith('#'):
+                continue
+
+            label = extinf or Path(line.replace('\\', '/')).stem
+            extinf = None
+            if ' - ' in label:
+                artist, title = label.split(' - ', 1)
+                song = format_song(title, artist)
+            else:
+                song = format_song(label, '')
+            if song:
+                yield song
+
+def iter_json_track_objects(f):
+    """
+    Recorre un JSON por bloques y devuelve los objetos que pueden ser pistas:
+
+    - Objetos "hoja" (sin objetos anidados), como las pistas de la descarga
+      de datos de la cuenta de Spotify ({"trackName": ..., "artistName": ...}).
+    - El valor completo de cada clave "track", aunque tenga objetos anidados,
+      como en la Web API ({"track": {"name": ..., "artists": [{"name": ...}]}}).
+      Los objetos de dentro (artistas, álbum) no se devuelven por separado.
+
+    Solo se guarda en memoria el objeto que se está leyendo.
+    """
+    in_string = False
+    escaped = False
+    buffer = None          # Objeto hoja candidato
+    track = None           # Objeto "track" completo que se está capturando
+    depth = 0              # Profundidad dentro del objeto "track"
+    string = None          # Texto de la cadena actual (fuera de "track")
+    last_string = None     # Última cadena cerrada, por si es una clave
+    key = None             # Clave cuyo valor viene a continuación
+
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        for char in chunk:
+            if track is not None:
+                track.append(char)
+            elif buffer is not None:
+                buffer.append(char)
+
+            if in_string:
+                if escaped:
+                    escaped = False
+                    if string is not None:
+                        string.append(char)
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    if string is not None:
+                        last_string = ''.join(string)
+                        string = None
+                elif string is not None:
+                    string.append(char)
+                continue
+
+            if char == '"':
+                in_string = True
+                if track is None:
+                    string = []
+                continue
+
+            if track is not None:
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                    if depth == 0:
+                        try:
+                            yield json.loads(''.join(track))
+                        except json.JSONDecodeError:
+                            pass
+                        track = None
+                continue
+
+            if char == ':':
+                key = last_string
+                last_string = None
+                continue
+            if char.isspace():
+                continue
+
+            if char == '{':
+                if key == 'track':
+                    track = ['{']
+                    depth = 1
+                    buffer = None
+                else:
+                    # Empieza un objeto más interno: se descarta el anterior
+                    buffer = ['{']
+            elif char == '}' and buffer is not None:
+                try:
+                    yield json.loads(''.join(buffer))
+                except json.JSONDecodeError:
+                    pass
+                buffer = None
+            key = None
+            last_string = None
+
+def json_track_song(obj):
+    """
+    Convierte un objeto de pista en canción, o None si no es una pista.
+    Sin claves de pista explícitas no se acepta: un objeto con solo "name"
+    puede ser una playlist o un artista.
+    """
+    if isinstance(obj.get('trackName'), str):
+        return format_song(obj['trackName'], obj.get('artistName') if isinstance(obj.get('artistName'), str) else '')
+
+    # Web API: {"name": ..., "artists": [{"name": ...}]}
+    artists = obj.get('artists')
+    if isinstance(obj.get('name'), str) and isinstance(artists, list):
+        names = [a['name'] for a in artists if isinstance(a, dict) and isinstance(a.get('name'), str)]
+        if names:
+            return format_song(obj['name'], ', '.join(names))
+
+    # Objetos propios: {"title"/"track": ..., "artist": ...}
+    title = next((obj[k] for k in JSON_TITLE_KEYS if isinstance(obj.get(k), str)), None)
+    artist = next((obj[k] for k in JSON_ARTIST_KEYS if isinstance(obj.get(k), str)), None)
+    if title is None or artist is None:
+        return None
+    return format_song(title, artist)
+
+def iter_json(path):
+    """Genera canciones de una exportación JSON (Spotify u objetos título/artista)"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for obj in iter_json_track_objects(f):
+            song = json_track_song(obj)
+            if song:
+                yield song
+
+READERS = {
+    '.csv': iter_csv,
+    '.tsv': iter_csv,
+    '.m3u': iter_m3u,
+    '.m3u8': iter_m3u,
+    '.json': iter_json,
+}
+
+def iter_songs(path):
+    """Elige el lector adecuado según la extensión del fichero"""
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f'Formato no soportado: {path.suffix} ({path})')
+    return reader(path)
+
+def save_playlists(playlists, path=PLAYLISTS_PATH):
+    """Escribe el catálogo de forma atómica (fichero temporal + rename)"""
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(playlists, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def import_files(files, category=None, limit=None, playlists_path=PLAYLISTS_PATH, dry_run=False):
+    """
+    Importa los ficheros indicados al catálogo.
+
+    Args:
+        files: Lista de rutas a importar
+        category: Categoría destino (por defecto, el nombre de cada fichero)
+        limit: Máximo de canciones nuevas por categoría
+        playlists_path: Ruta de playlists.json
+        dry_run: Si es True no se escribe nada
+
+    Returns:
+        Diccionario {categoría: canciones añadidas}
+    """
+    playlists = load_playlists(playlists_path)
+
+    # Conjunto de hashes compartido por todas las categorías
+    seen = set()
+    for songs in playlists.values():
+        for song in songs:
+            seen.add(song_key(song))
+
+    added = {}
+    for file_path in files:
+        file_path = Path(file_path)
+        target = category or file_path.stem
+        songs = playlists.setdefault(target, [])
+        added.setdefault(target, 0)
+        read = 0
+        new = 0
+
+        print(f'📄 Importando: {file_path} → {target}')
+        for song in iter_songs(file_path):
+            read += 1
+            if read % 100000 == 0:
+                print(f'   … {read} filas leídas, {new} nuevas')
+            if limit is not None and added[target] >= limit:
+                break
+            key = song_key(song)
+            if key in seen:
+                continue
+            seen.add(key)
+            songs.append(song)
+            added[target] += 1
+            new += 1
+
+        print(f'   ✅ {read} filas leídas, {new} canciones nuevas')
+        if not songs:
+            del playlists[target]
+
+    if not dry_run:
+        save_playlists(playlists, playlists_path)
+        print(f'\n💾 Catálogo guardado en: {playlists_path}')
+
+    return added
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description='Importa playlists (CSV, M3U, JSON) a data/playlists.json')
+    parser.add_argument('archivos', nargs='+', help='Ficheros a importar')
+    parser.add_argument('-c', '--categoria', help='Categoría destino (por defecto, el nombre del fichero)')
+    parser.add_argument('-l', '--limite', type=int, help='Máximo de canciones nuevas por categoría')
+    parser.add_argument('--simular', action='store_true', help='No escribe playlists.json')
+    args = parser.parse_args()
+
+    print('\n🎵 Importando playlists...\n')
+    try:
+        added = import_files(args.archivos, args.categoria, args.limite, dry_run=args.simular)
+    except (OSError, ValueError) as e:
+        print(f'❌ Error: {e}')
+        sys.exit(1)
+
+    print('\n📊 Resumen:')
+    for cat, count in added.items():
+        print(f'  - {cat}: {count} canciones nuevas')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Optimizador del orden de canciones para Bingo Musical
+Busca un orden de llamada en el que el primer "¡Bingo!" (cartón completo)
+llegue en la canción deseada y con el número de ganadores deseado.
+
+Trabaja sobre las listas de cartones de generate_cards() (o un
+cartones-*.md ya generado), recortadas a las canciones que se imprimen en el
+cartón visual (win_patterns.get_layout). En lugar de simular la partida entera para cada
+candidato, mantiene cuántas canciones de cada cartón están dentro del
+conjunto de llamadas y lo actualiza solo para los cartones afectados por
+cada cambio.
+
+Uso:
+    python scripts/optimize-call-order.py --categoria "Navidad" --tamano grandes --cancion 22 --ganadores 1
+    python scripts/optimize-call-order.py --cartones cartones/navidad/grandes/cartones-navidad-grandes.md --cancion 22
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from win_patterns import LAYOUTS, get_layout
+
+def load_generator():
+    """Importa scripts/generate-cards.py (el guion impide un import normal)"""
+    spec = importlib.util.spec_from_file_location('generate_cards', Path(__file__).parent / 'generate-cards.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def parse_cards_markdown(md_content):
+    """Lee las listas de canciones de un cartones-*.md (mismo formato que save_cards_to_markdown)"""
+    cards = []
+    for line in md_content.split('\n'):
+        line = line.strip()
+        if line.startswith('## Cartón'):
+            cards.append([])
+        elif cards and re.match(r'^\d+\.\s+', line):
+            cards[-1].append(re.sub(r'^\d+\.\s+', '', line))
+    return [card for card in cards if card]
+
+def detect_card_size(file_path):
+    """Tamaño del cartón según el nombre del archivo (como generate-visual-cards.py)"""
+    path_str = str(file_path).lower()
+    if 'pequeños' in path_str or 'pequenos' in path_str:
+        return 'pequeños'
+    elif 'grandes' in path_str:
+        return 'grandes'
+    return 'medianos'
+
+def printed_cards(cards, size_type):
+    """
+    Recorta cada cartón a las canciones que aparecen en la imagen, en el
+    mismo orden que build_cells: un cartón completo es el cartón impreso.
+    """
+    num_songs = get_layout(size_type)['songs']
+    return [card[:num_songs] for card in cards]
+
+def simulate(cards, order):
+    """
+    Juega la partida con un orden de llamada dado.
+
+    Returns:
+        (número de canción del primer bingo, números de cartón ganadores)
+        o (None, []) si nadie completa el cartón
+    """
+    remaining = [len(set(card)) for card in cards]
+    by_song = {}
+    for card_idx, card in enumerate(cards):
+        for song in set(card):
+            by_song.setdefault(song, []).append(card_idx)
+
+    for call_num, song in enumerate(order, 1):
+        winners = []
+        for card_idx in by_song.get(song, []):
+            remaining[card_idx] -= 1
+            if remaining[card_idx] == 0:
+                winners.append(card_idx + 1)
+        if winners:
+            return call_num, winners
+    return None, []
+
+class CallSetSearch:
+    """
+    Búsqueda local sobre el conjunto S de las primeras T canciones.
+
+    El primer bingo llega exactamente en la llamada T con W ganadores si los
+    cartones completos dentro de S son W y todos comparten una canción x:
+    esa x se canta la última y ningún cartón puede completarse antes.
+    """
+
+    def __init__(self, cards, songs, rng):
+        self.songs = songs
+        self.rng = rng
+        song_idx = {song: i for i, song in enumerate(songs)}
+        self.card_sizes = []
+        self.card_masks = []
+        self.by_song = [[] for _ in songs]
+        for card_idx, card in enumerate(cards):
+            ids = {song_idx[song] for song in card}
+            self.card_sizes.append(len(ids))
+            self.card_masks.append(sum(1 << i for i in ids))
+            for i in ids:
+                self.by_song[i].append(card_idx)
+
+    def reset(self, size):
+        """Empieza desde un conjunto aleatorio de `size` canciones"""
+        chosen = self.rng.sample(range(len(self.songs)), size)
+        self.inside = set(chosen)
+        self.outside = [i for i in range(len(self.songs)) if i not in self.inside]
+        self.inside_list = list(chosen)
+        self.counts = [0] * len(self.card_sizes)
+        self.complete = set()
+        for i in chosen:
+            self._add(i)
+
+    def _add(self, song):
+        for card_idx in self.by_song[song]:
+            self.counts[card_idx] += 1
+            if self.counts[card_idx] == self.card_sizes[card_idx]:
+                self.complete.add(card_idx)
+
+    def _remove(self, song):
+        for card_idx in self.by_song[song]:
+            if self.counts[card_idx] == self.card_sizes[card_idx]:
+                self.complete.discard(card_idx)
+            self.counts[card_idx] -= 1
+
+    def common_song(self):
+        """Canción compartida por todos los cartones completos (o None)"""
+        if not self.complete:
+            return None
+        mask = -1
+        for card_idx in self.complete:
+            mask &= self.card_masks[card_idx]
+            if not mask:
+                return None
+        return (mask & -mask).bit_length() - 1
+
+    def cost(self, winners):
+        """0 cuando el conjunto cumple el objetivo"""
+        diff = abs(len(self.complete) - winners)
+        if diff:
+            return 2 * diff
+        return 0 if self.common_song() is not None else 1
+
+    def swap(self, out_pos, in_pos):
+        """Intercambia una canción de dentro por una de fuera"""
+        song_out = self.inside_list[out_pos]
+        song_in = self.outside[in_pos]
+        self._remove(song_out)
+        self._add(song_in)
+        self.inside.discard(song_out)
+        self.inside.add(song_in)
+        self.inside_list[out_pos] = song_in
+        self.outside[in_pos] = song_out
+
+    def run(self, size, winners, max_steps, deadline):
+        """Recocido simulado; devuelve el conjunto si encuentra coste 0"""
+        self.reset(size)
+        current = self.cost(winners)
+        temperature = 1.0
+        for step in range(max_steps):
+            if current == 0:
+                return self.inside_list[:]
+            if not self.outside or (step & 1023) == 0 and time.monotonic() > deadline:
+                return None
+            out_pos = self.rng.randrange(len(self.inside_list))
+            in_pos = self.rng.randrange(len(self.outside))
+            self.swap(out_pos, in_pos)
+            candidate = self.cost(winners)
+            delta = candidate - current
+            if delta <= 0 or self.rng.random() < math.exp(-delta / temperature):
+                current = candidate
+            else:
+                self.swap(out_pos, in_pos)  # Deshacer
+            temperature = max(0.05, temperature * 0.999)
+        return None
+
+def optimize_call_order(cards, target_call, winners=1, songs=None, tolerance=0,
+                        time_limit=5.0, seed=None):
+    """
+    Busca un orden de llamada para un conjunto de cartones.
+
+    Args:
+        cards: Listas de canciones impresas (ver printed_cards)
+        target_call: Número de canción en el que debe llegar el primer bingo
+        winners: Número de cartones que deben cantar bingo a la vez
+        songs: Canciones disponibles (por defecto, todas las de los cartones)
+        tolerance: Se acepta el primer bingo en target_call ± tolerance
+        time_limit: Segundos máximos de búsqueda
+        seed: Semilla para resultados reproducibles
+
+    Returns:
+        Diccionario con 'orden', 'cancion' y 'ganadores', o None si no hay solución
+    """
+    if songs is None:
+        songs = list(dict.fromkeys(song for card in cards for song in card))
+
+    # Se prueba primero la canción objetivo y luego las más cercanas
+    candidates = [target_call]
+    for offset in range(1, tolerance + 1):
+        candidates += [target_call - offset, target_call + offset]
+    candidates = [c for c in candidates if 1 <= c <= len(songs)]
+
+    # Objetivo imposible: no hay nada que buscar
+    if not candidates or not 1 <= winners <= len(cards):
+        return None
+
+    rng = random.Random(seed)
+    search = CallSetSearch(cards, songs, rng)
+    deadline = time.monotonic() + time_limit
+
+    while time.monotonic() < deadline:
+        for size in candidates:
+            chosen = search.run(size, winners, max_steps=20000, deadline=deadline)
+            if chosen is None:
+                continue
+
+            last = search.common_song()
+            first = [i for i in chosen if i != last]
+            rest = [i for i in range(len(songs)) if i not in search.inside]
+            rng.shuffle(first)
+            rng.shuffle(rest)
+            order = [songs[i] for i in first + [last] + rest]
+
+            call_num, winning_cards = simulate(cards, order)
+            if call_num == size and len(winning_cards) == winners:
+                return {'orden': order, 'cancion': call_num, 'ganadores': winning_cards}
+    return None
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description='Busca un orden de canciones para una duración de partida')
+    parser.add_argument('--cartones', help='Archivo cartones-*.md a usar')
+    parser.add_argument('-c', '--categoria', help='Categoría de playlists.json (genera cartones nuevos)')
+    parser.add_argument('-t', '--tamano', help='pequeños, medianos o grandes (por defecto, según --cartones o medianos)')
+    parser.add_argument('--cancion', type=int, required=True, help='Canción en la que debe llegar el primer bingo')
+    parser.add_argument('--ganadores', type=int, default=1, help='Cartones ganadores a la vez')
+    parser.add_argument('--margen', type=int, default=0, help='Tolerancia en canciones')
+    parser.add_argument('--segundos', type=float, default=5.0, help='Tiempo máximo de búsqueda')
+    parser.add_argument('--semilla', type=int, help='Semilla aleatoria')
+    parser.add_argument('--json', dest='json_path', help='Guarda el orden en un JSON')
+    args = parser.parse_args()
+
+    generator = load_generator()
+
+    if args.cartones:
+        with open(args.cartones, 'r', encoding='utf-8') as f:
+            cards = parse_cards_markdown(f.read())
+        songs = None
+        size_type = args.tamano or detect_card_size(args.cartones)
+        source = args.cartones
+    elif args.categoria:
+        size_type = args.tamano or 'medianos'
+        playlists = generator.load_playlists()
+        if args.categoria not in playlists or size_type not in generator.CONFIG:
+            print(f'❌ Categoría o tamaño desconocido: {args.categoria} / {size_type}')
+            sys.exit(1)
+        songs = playlists[args.categoria]
+        config = generator.CONFIG[size_type]
+        if args.semilla is not None:
+            random.seed(args.semilla)
+        cards = generator.generate_cards(songs, config['canciones'], config['cartones'])
+        source = f'{args.categoria} ({size_type})'
+    else:
+        parser.error('indica --cartones o --categoria')
+
+    if size_type not in LAYOUTS:
+        print(f'❌ Tamaño desconocido: {size_type}')
+        sys.exit(1)
+    cards = printed_cards(cards, size_type)
+
+    if not cards:
+        print('❌ No se encontraron cartones')
+        sys.exit(1)
+
+    num_songs = len(songs) if songs is not None else len({song for card in cards for song in card})
+    if not 1 <= args.ganadores <= len(cards):
+        print(f'❌ --ganadores debe estar entre 1 y {len(cards)} (número de cartones)')
+        sys.exit(1)
+    if args.cancion + args.margen < 1 or args.cancion - args.margen > num_songs:
+        print(f'❌ --cancion debe estar entre 1 y {num_songs} (canciones disponibles)')
+        sys.exit(1)
+
+    print(f'\n🎵 Optimizando orden de llamada: {source}')
+    print(f'   {len(cards)} cartones {size_type} ({len(cards[0])} canciones impresas) · objetivo: bingo en la canción {args.cancion} '
+          f'(±{args.margen}) con {args.ganadores} ganador(es)\n')
+
+    start = time.monotonic()
+    result = optimize_call_order(cards, args.cancion, args.ganadores, songs=songs,
+                                 tolerance=args.margen, time_limit=args.segundos, seed=args.semilla)
+    elapsed = time.monotonic() - start
+
+    if result is None:
+        print(f'⚠️  No se encontró ningún orden en {elapsed:.1f}s. Prueba con más --margen o --segundos.')
+        sys.exit(1)
+
+    print(f"✅ Encontrado en {elapsed:.2f}s: bingo en la canción {result['cancion']}, "
+          f"cartones ganadores: {', '.join(f'#{n}' for n in result['ganadores'])}\n")
+    for idx, song in enumerate(result['orden'], 1):
+        marker = '  ← ¡Bingo!' if idx == result['cancion'] else ''
+        print(f'{idx:3d}. {song}{marker}')
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'\n💾 Guardado en: {args.json_path}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cola de pedidos personalizados de Bingo Musical
+Guarda los pedidos ("300 cartones grandes con mis 60 canciones, en PDF y
+ZIP") en una base SQLite (pedidos/pedidos.db) y los procesa con un grupo
+de procesos: generación (generate_cards), dibujo (create_bingo_card_image)
+y empaquetado (PDF y ZIP).
+
+- Cada pedido se ejecuta en su propio proceso, con límite de memoria y de
+  tiempo; si se pasa, se detiene y se reintenta más tarde.
+- Los fallos se reintentan con espera exponencial hasta max_intentos.
+- Ningún cliente ocupa más de --max-por-cliente procesos a la vez y los
+  pedidos que llevan tiempo esperando ganan prioridad, así que un pedido
+  grande no deja parados a los demás.
+- Se pueden lanzar varios `workers` a la vez sobre la misma base.
+
+Uso:
+    python scripts/order-queue.py add "Fiesta Colegio" --cliente colegio-sol --canciones mis-canciones.txt --tamano grandes --cartones 300
+    python scripts/order-queue.py add "Navidad Oficina" --cliente acme --categoria Navidad --tema navidad --cartones 50 --formatos pdf
+    python scripts/order-queue.py workers -n 4
+    python scripts/order-queue.py status
+    python scripts/order-queue.py retry 12
+    python scripts/order-queue.py cancel 12
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+import unicodedata
+import zipfile
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: sin límites del sistema, solo el de tiempo
+
+BASE_DIR = Path(__file__).parent.parent
+ORDERS_DIR = BASE_DIR / 'pedidos'
+DB_PATH = ORDERS_DIR / 'pedidos.db'
+
+FORMATS = ('pdf', 'zip')
+STATES = ('pendiente', 'en_curso', 'completado', 'fallido', 'cancelado')
+
+# Valores por defecto de cada pedido
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MEMORY_MB = 1024
+DEFAULT_SECONDS = 1800
+
+RETRY_BASE_SECONDS = 5     # Espera antes del reintento n: 5 · 2^(n-1) segundos
+LEASE_SECONDS = 60         # Un pedido en curso sin latido durante este tiempo se da por huérfano
+AGING_SECONDS = 600        # Cada 10 minutos de espera suman un punto de prioridad
+POLL_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pedidos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    cliente TEXT NOT NULL,
+    tema TEXT NOT NULL,
+    titulo TEXT,
+    canciones TEXT NOT NULL,
+    tamano TEXT NOT NULL,
+    num_cartones INTEGER NOT NULL,
+    formatos TEXT NOT NULL,
+    semilla INTEGER NOT NULL,
+    prioridad INTEGER NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    max_intentos INTEGER NOT NULL,
+    limite_memoria_mb INTEGER NOT NULL,
+    limite_segundos INTEGER NOT NULL,
+    progreso REAL NOT NULL DEFAULT 0,
+    mensaje TEXT,
+    resultado TEXT,
+    error TEXT,
+    worker TEXT,
+    creado REAL NOT NULL,
+    actualizado REAL NOT NULL,
+    disponible_desde REAL NOT NULL,
+    latido REAL
+);
+CREATE INDEX IF NOT EXISTS pedidos_estado ON pedidos (estado, disponible_desde);
+"""
+
+def load_script(module_name, filename):
+    """Importa un script de esta carpeta (el guion impide un import normal)"""
+    spec = importlib.util.spec_from_file_location(module_name, Path(__file__).parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def connect(db_path=DB_PATH):
+    """Abre la base de pedidos (la crea si no existe)"""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA busy_timeout=30000')
+    conn.executescript(SCHEMA)
+    return conn
+
+def slugify(text):
+    """Nombre de carpeta seguro para un pedido: "Fiesta Colegio Sol" → fiesta-colegio-sol"""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'pedido'
+
+def order_dir(job):
+    """Carpeta de salida de un pedido: pedidos/00012-fiesta-colegio/"""
+    return ORDERS_DIR / f"{job['id']:05d}-{slugify(job['nombre'])}"
+
+def read_song_file(path):
+    """
+    Lee las canciones de un pedido: un .txt con una canción por línea o
+    cualquier formato de import-playlists.py (CSV, M3U, JSON de Spotify).
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.txt':
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            songs = [line.strip() for line in f if line.strip()]
+    else:
+        importer = load_script('import_playlists', 'import-playlists.py')
+        songs = list(importer.iter_songs(path))
+    return list(dict.fromkeys(songs))
+
+def add_order(conn, name, client, songs, size, num_cards, formats=FORMATS, theme='default',
+              title=None, priority=0, max_attempts=DEFAULT_MAX_ATTEMPTS,
+              memory_mb=DEFAULT_MEMORY_MB, seconds=DEFAULT_SECONDS, seed=None):
+    """
+    Añade un pedido a la cola.
+
+    Returns:
+        Id del pedido
+    """
+    config = load_script('generate_cards', 'generate-cards.py').CONFIG
+    if size not in config:
+        raise ValueError(f'Tamaño desconocido: {size}')
+    if len(songs) < config[size]['canciones']:
+        raise ValueError(f"Los cartones {size} necesitan al menos {config[size]['canciones']} canciones "
+                         f"y el pedido tiene {len(songs)}")
+    if num_cards < 1:
+        raise ValueError('El pedido debe tener al menos un cartón')
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Formatos desconocidos: {', '.join(sorted(unknown))}")
+
+    now = time.time()
+    cursor = conn.execute(
+        """INSERT INTO pedidos (nombre, cliente, tema, titulo, canciones, tamano, num_cartones,
+                                formatos, semilla, prioridad, max_intentos, limite_memoria_mb,
+                                limite_segundos, creado, actualizado, disponible_desde)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (name, client, theme, title, json.dumps(songs, ensure_ascii=False), size, num_cards,
+         ','.join(formats), seed if seed is not None else random.getrandbits(32), priority,
+         max_attempts, memory_mb, seconds, now, now, now))
+    return cursor.lastrowid
+
+def fail_or_retry(conn, job_id, error):
+    """Vuelve a poner un pedido en cola con espera exponencial, o lo marca como fallido"""
+    job = conn.execute('SELECT intentos, max_intentos FROM pedidos WHERE id = ?', (job_id,)).fetchone()
+    now = time.time()
+    if job['intentos'] < job['max_intentos']:
+        delay = RETRY_BASE_SECONDS * 2 ** (job['intentos'] - 1)
+        conn.execute("""UPDATE pedidos SET estado = 'pendiente', worker = NULL, error = ?,
+                               mensaje = ?, disponible_desde = ?, actualizado = ?
+                        WHERE id = ? AND estado = 'en_curso'""",
+                     (error, f'Reintento en {delay:.0f}s', now + delay, now, job_id))
+        return 'pendiente'
+    conn.execute("""UPDATE pedidos SET estado = 'fallido', worker = NULL, error = ?,
+                           mensaje = 'Sin más reintentos', actualizado = ?
+                    WHERE id = ? AND estado = 'en_curso'""", (error, now, job_id))
+    return 'fallido'
+
+def requeue_orphans(conn):
+    """Recupera los pedidos de workers que han dejado de dar señales de vida"""
+    stale = conn.execute("SELECT id FROM pedidos WHERE estado = 'en_curso' AND latido < ?",
+                         (time.time() - LEASE_SECONDS,)).fetchall()
+    for row in stale:
+        fail_or_retry(conn, row['id'], 'El worker dejó de responder')
+
+def claim_job(conn, worker, max_per_client):
+    """
+    Reserva el siguiente pedido de forma atómica.
+
+    Orden: prioridad (más el envejecimiento por espera), después el cliente
+    con menos pedidos en curso y por último el más antiguo. Los clientes que
+    ya tienen max_per_client pedidos en curso se saltan.
+    """
+    now = time.time()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        requeue_orphans(conn)
+        job = conn.execute(
+            """WITH activos AS (
+                   SELECT cliente, COUNT(*) AS n FROM pedidos WHERE estado = 'en_curso' GROUP BY cliente
+               )
+               SELECT p.* FROM pedidos p LEFT JOIN activos a ON a.cliente = p.cliente
+               WHERE p.estado = 'pendiente' AND p.disponible_desde <= :now
+                 AND COALESCE(a.n, 0) < :max_por_cliente
+               ORDER BY p.prioridad + (:now - p.creado) / :aging DESC, COALESCE(a.n, 0), p.creado
+               LIMIT 1""",
+            {'now': now, 'max_por_cliente': max_per_client, 'aging': AGING_SECONDS}).fetchone()
+        if job is not None:
+            conn.execute("""UPDATE pedidos SET estado = 'en_curso', worker = ?, intentos = intentos + 1,
+                                   progreso = 0, mensaje = 'Empezando', error = NULL,
+                                   latido = ?, actualizado = ?
+                            WHERE id = ?""", (worker, now, now, job['id']))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return job
+
+class Progress:
+    """Publica el avance de un pedido en la base (como mucho una vez por punto)"""
+
+    def __init__(self, conn, job_id, weights):
+        self.conn = conn
+        self.job_id = job_id
+        total = sum(weights.values())
+        self.weights = {stage: w / total for stage, w in weights.items()}
+        self.done = 0.0
+        self.last = -1
+
+    def update(self, stage, fraction, message):
+        value = round(100 * (self.done + self.weights[stage] * fraction), 1)
+        if int(value) == self.last and fraction < 1:
+            return
+        self.last = int(value)
+        self.conn.execute('UPDATE pedidos SET progreso = ?, mensaje = ?, actualizado = ? WHERE id = ?',
+                          (value, message, time.time(), self.job_id))
+
+    def finish(self, stage, message):
+        self.update(stage, 1, message)
+        self.done += self.weights[stage]
+
+def apply_limits(memory_mb, seconds):
+    """Limita la memoria y el tiempo de CPU del proceso actual (si el sistema lo permite)"""
+    if resource is None:
+        return
+    memory = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 5))
+
+def build_pdf(png_paths, pdf_path, on_page):
+    """Une los PNG en un PDF añadiendo página a página (sin cargarlos todos en memoria)"""
+    from PIL import Image
+
+    tmp = pdf_path.with_name(pdf_path.name + '.tmp')
+    if tmp.exists():
+        tmp.unlink()
+    for idx, png in enumerate(png_paths, 1):
+        with Image.open(png) as page:
+            page.convert('RGB').save(tmp, 'PDF', resolution=150, append=idx > 1)
+        on_page(idx)
+    os.replace(tmp, pdf_path)
+
+def build_zip(paths, zip_path, on_file):
+    """Empaqueta los cartones, el listado y el catálogo en un ZIP"""
+    tmp = zip_path.with_name(zip_path.name + '.tmp')
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for idx, path in enumerate(paths, 1):
+            zipf.write(path, path.name)
+            on_file(idx)
+    os.replace(tmp, zip_path)
+
+def process_order(conn, job):
+    """
+    Genera, dibuja y empaqueta un pedido.
+
+    Returns:
+        Diccionario con las rutas generadas
+    """
+    generator = load_script('generate_cards', 'generate-cards.py')
+    visual = load_script('generate_visual_cards', 'generate-visual-cards.py')
+
+    songs = json.loads(job['canciones'])
+    size = job['tamano']
+    formats = [f for f in job['formatos'].split(',') if f]
+    theme_key = job['tema'] if job['tema'] in visual.CATEGORY_THEMES else 'default'
+    theme = dict(visual.CATEGORY_THEMES[theme_key])
+    if job['titulo']:
+        theme['title'] = job['titulo']
+
+    weights = {'generar': 5, 'dibujar': 70}
+    weights.update({fmt: 10 for fmt in formats})
+    progress = Progress(conn, job['id'], weights)
+
+    # Cada intento empieza de cero: con la misma semilla salen los mismos cartones
+    out_dir = order_dir(job)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    png_dir = out_dir / 'png'
+    png_dir.mkdir(parents=True)
+    random.seed(job['semilla'])
+
+    # 1. Generación
+    cards = generator.generate_cards(songs, generator.CONFIG[size]['canciones'], job['num_cartones'])
+    index = generator.save_cards_to_markdown(job['nombre'], size, cards, songs, output_dir=out_dir)
+    progress.finish('generar', f'{len(cards)} cartones generados')
+
+    # 2. Dibujo
+    file_stem = f'{slugify(job["nombre"])}-{size}'
+    catalog = (job['nombre'], songs)
+    png_paths = []
+    layouts = {}
+    for numero, card_songs in enumerate(cards, 1):
+        card = {'numero': numero, 'songs': card_songs}
+        png_path = png_dir / f'{file_stem}-carton-{numero:03d}.png'
+        visual.create_bingo_card_image(card, theme, png_path, size_type=size, catalog=catalog,
+                                       category=theme_key)
+        png_paths.append(png_path)
+        layouts[str(numero)] = {'comodines': card['comodines'], 'libres': card['libres']}
+        progress.update('dibujar', numero / len(cards), f'Cartón {numero}/{len(cards)}')
+    with open(png_dir / f'{file_stem}-comodines.json', 'w', encoding='utf-8') as f:
+        json.dump({'tamaño': size, 'cartones': layouts}, f, ensure_ascii=False, indent=2)
+    progress.finish('dibujar', f'{len(png_paths)} imágenes')
+
+    # Catálogo del pedido: sus canciones no están en playlists.json, así que
+    # card_codes.py --listado lo necesita para verificar los códigos
+    catalog_path = out_dir / 'catalogo.json'
+    with open(catalog_path, 'w', encoding='utf-8') as f:
+        json.dump({'categoria': job['nombre'], 'canciones': songs}, f, ensure_ascii=False, indent=2)
+
+    result = {'carpeta': out_dir.as_posix(), 'listado': index['listado'], 'catalogo': catalog_path.as_posix(),
+              'cartones': index['cartones'], 'imagenes': len(png_paths)}
+
+    # 3. Empaquetado
+    if 'pdf' in formats:
+        pdf_path = out_dir / f'{file_stem}.pdf'
+        build_pdf(png_paths, pdf_path,
+                  lambda n: progress.update('pdf', n / len(png_paths), f'PDF: página {n}/{len(png_paths)}'))
+        progress.finish('pdf', 'PDF listo')
+        result['pdf'] = pdf_path.as_posix()
+
+    if 'zip' in formats:
+        zip_path = out_dir / f'{file_stem}.zip'
+        contents = png_paths + [Path(index['listado']), catalog_path]
+        build_zip(contents, zip_path,
+                  lambda n: progress.update('zip', n / len(contents), f'ZIP: {n}/{len(contents)} archivos'))
+        progress.finish('zip', 'ZIP listo')
+        result['zip'] = zip_path.as_posix()
+
+    return result
+
+def run_job(db_path, job_id):
+    """Proceso hijo: aplica los límites, procesa el pedido y guarda el resultado"""
+    conn = connect(db_path)
+    job = conn.execute('SELECT * FROM pedidos WHERE id = ?', (job_id,)).fetchone()
+    try:
+        apply_limits(job['limite_memoria_mb'], job['limite_segundos'])
+        result = process_order(conn, job)
+    except MemoryError:
+        conn.execute('UPDATE pedidos SET error = ? WHERE id = ?',
+                     (f"Límite de memoria superado ({job['limite_memoria_mb']} MB)", job_id))
+        sys.exit(1)
+    except Exception as e:
+        conn.execute('UPDATE pedidos SET error = ? WHERE id = ?',
+                     (f'{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}', job_id))
+        sys.exit(1)
+    conn.execute('UPDATE pedidos SET resultado = ? WHERE id = ?',
+                 (json.dumps(result, ensure_ascii=False), job_id))
+
+def finish_job(conn, job_id, process, started, limit):
+    """Cierra un pedido cuyo proceso ha terminado; devuelve el estado final"""
+    row = conn.execute('SELECT estado, resultado, error FROM pedidos WHERE id = ?', (job_id,)).fetchone()
+    if row['estado'] != 'en_curso':
+        return row['estado']
+    if process.exitcode == 0 and row['resultado']:
+        conn.execute("""UPDATE pedidos SET estado = 'completado', progreso = 100, mensaje = 'Completado',
+                               worker = NULL, actualizado = ? WHERE id = ?""", (time.time(), job_id))
+        return 'completado'
+    error = row['error']
+    if time.monotonic() - started >= limit:
+        error = f'Tiempo máximo superado ({limit}s)'
+    elif not error:
+        error = f'El proceso terminó con código {process.exitcode}'
+    return fail_or_retry(conn, job_id, error)
+
+def run_workers(num_workers, max_per_client, once=False, db_path=DB_PATH):
+    """
+    Procesa la cola con hasta num_workers pedidos en paralelo, cada uno en su
+    propio proceso. Con once=True termina cuando no quedan pedidos por hacer.
+    """
+    conn = connect(db_path)
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    running = {}  # id → (proceso, inicio, límite en segundos)
+
+    print(f"⚙️  Worker {worker}: {num_workers} procesos, máximo {max_per_client} por cliente")
+    print("=" * 60)
+
+    try:
+        while True:
+            while len(running) < num_workers:
+                job = claim_job(conn, worker, max_per_client)
+                if job is None:
+                    break
+                process = multiprocessing.Process(target=run_job, args=(str(db_path), job['id']))
+                process.start()
+                running[job['id']] = (process, time.monotonic(), job['limite_segundos'])
+                print(f"▶️  #{job['id']} {job['nombre']} ({job['cliente']}): "
+                      f"{job['num_cartones']} cartones {job['tamano']}, intento {job['intentos'] + 1}")
+
+            now = time.time()
+            for job_id, (process, started, limit) in list(running.items()):
+                state = conn.execute('SELECT estado FROM pedidos WHERE id = ?', (job_id,)).fetchone()['estado']
+                if process.is_alive():
+                    if state != 'cancelado' and time.monotonic() - started < limit:
+                        conn.execute('UPDATE pedidos SET latido = ? WHERE id = ?', (now, job_id))
+                        continue
+                    process.terminate()
+                process.join()
+                final = finish_job(conn, job_id, process, started, limit)
+                del running[job_id]
+                icon = {'completado': '✅', 'pendiente': '🔁', 'cancelado': '🚫'}.get(final, '❌')
+                print(f"{icon} #{job_id}: {final}")
+
+            if once and not running:
+                pending = conn.execute("SELECT COUNT(*) FROM pedidos WHERE estado IN ('pendiente', 'en_curso')").fetchone()[0]
+                if not pending:
+                    break
+            time.sleep(POLL_SECONDS)
+    except KeyboardInterrupt:
+        print("\n⏹️  Deteniendo: los pedidos en curso vuelven a la cola")
+        for job_id, (process, _, _) in running.items():
+            process.terminate()
+            process.join()
+            conn.execute("""UPDATE pedidos SET estado = 'pendiente', worker = NULL, mensaje = 'Interrumpido',
+                                   intentos = MAX(intentos - 1, 0), actualizado = ?
+                            WHERE id = ? AND estado = 'en_curso'""", (time.time(), job_id))
+
+    print("=" * 60)
+    print("✅ Cola vacía")
+
+def show_status(conn, job_id=None):
+    """Muestra el estado de los pedidos (o el detalle de uno)"""
+    if job_id is not None:
+        job = conn.execute('SELECT * FROM pedidos WHERE id = ?', (job_id,)).fetchone()
+        if job is None:
+            print(f'❌ No existe el pedido #{job_id}')
+            sys.exit(1)
+        print(f"📋 Pedido #{job['id']}: {job['nombre']} ({job['cliente']})")
+        print("=" * 60)
+        print(f"   Estado:    {job['estado']} · {job['progreso']:.0f}% · {job['mensaje'] or ''}")
+        print(f"   Cartones:  {job['num_cartones']} {job['tamano']} · tema {job['tema']} · "
+              f"{len(json.loads(job['canciones']))} canciones")
+        print(f"   Formatos:  png,{job['formatos']}")
+        print(f"   Intentos:  {job['intentos']}/{job['max_intentos']}")
+        print(f"   Límites:   {job['limite_memoria_mb']} MB · {job['limite_segundos']}s")
+        if job['resultado']:
+            for key, value in json.loads(job['resultado']).items():
+                print(f"   {key}: {value}")
+        if job['error']:
+            print(f"   ⚠️  {job['error']}")
+        return
+
+    jobs = conn.execute('SELECT * FROM pedidos ORDER BY id').fetchall()
+    if not jobs:
+        print('📭 No hay pedidos')
+        return
+    print(f"{'ID':>5}  {'Cliente':<16} {'Pedido':<24} {'Estado':<11} {'Progreso':<16} Intentos")
+    print("=" * 84)
+    for job in jobs:
+        filled = int(job['progreso'] / 10)
+        bar = '█' * filled + '░' * (10 - filled)
+        print(f"{job['id']:>5}  {job['cliente'][:16]:<16} {job['nombre'][:24]:<24} {job['estado']:<11} "
+              f"{bar} {job['progreso']:>3.0f}%  {job['intentos']}/{job['max_intentos']}")
+    counts = {state: 0 for state in STATES}
+    for job in jobs:
+        counts[job['estado']] += 1
+    print("=" * 84)
+    print(' · '.join(f'{state}: {n}' for state, n in counts.items()))
+
+def retry_order(conn, job_id):
+    """Vuelve a poner en cola un pedido fallido o cancelado"""
+    now = time.time()
+    cursor = conn.execute("""UPDATE pedidos SET estado = 'pendiente', intentos = 0, progreso = 0,
+                                    error = NULL, mensaje = 'Reintento manual',
+                                    disponible_desde = ?, actualizado = ?
+                             WHERE id = ? AND estado IN ('fallido', 'cancelado')""", (now, now, job_id))
+    return cursor.rowcount > 0
+
+def cancel_order(conn, job_id):
+    """Cancela un pedido pendiente o en curso (el worker detiene su proceso)"""
+    cursor = conn.execute("""UPDATE pedidos SET estado = 'cancelado', mensaje = 'Cancelado', actualizado = ?
+                             WHERE id = ? AND estado IN ('pendiente', 'en_curso')""", (time.time(), job_id))
+    return cursor.rowcount > 0
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description='Cola de pedidos personalizados de cartones')
+    commands = parser.add_subparsers(dest='comando', required=True)
+
+    add_parser = commands.add_parser('add', help='Añade un pedido')
+    add_parser.add_argument('nombre', help='Nombre del pedido (aparece en el listado y en los códigos)')
+    add_parser.add_argument('--cliente', required=True, help='Cliente (para repartir los workers)')
+    source = add_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--canciones', help='Fichero de canciones: .txt (una por línea), CSV, M3U o JSON')
+    source.add_argument('--categoria', help='Categoría de playlists.json')
+    add_parser.add_argument('-t', '--tamano', default='medianos', help='pequeños, medianos o grandes')
+    add_parser.add_argument('-n', '--cartones', type=int, required=True, help='Número de cartones')
+    add_parser.add_argument('--formatos', default=','.join(FORMATS), help='Paquetes además de los PNG: pdf,zip')
+    add_parser.add_argument('--tema', default='default', help='Tema de colores (navidad, rock, ...)')
+    add_parser.add_argument('--titulo', help='Título impreso en los cartones')
+    add_parser.add_argument('--prioridad', type=int, default=0, help='Mayor número, antes se procesa')
+    add_parser.add_argument('--intentos', type=int, default=DEFAULT_MAX_ATTEMPTS, help='Intentos máximos')
+    add_parser.add_argument('--memoria', type=int, default=DEFAULT_MEMORY_MB, help='Límite de memoria en MB')
+    add_parser.add_argument('--segundos', type=int, default=DEFAULT_SECONDS, help='Tiempo máximo por intento')
+    add_parser.add_argument('--semilla', type=int, help='Semilla aleatoria')
+
+    workers_parser = commands.add_parser('workers', help='Procesa la cola')
+    workers_parser.add_argument('-n', '--procesos', type=int, default=os.cpu_count() or 2,
+                                help='Pedidos en paralelo')
+    workers_parser.add_argument('--max-por-cliente', type=int, default=2,
+                                help='Pedidos en paralelo de un mismo cliente')
+    workers_parser.add_argument('--una-vez', action='store_true', help='Termina cuando la cola está vacía')
+
+    status_parser = commands.add_parser('status', help='Estado de los pedidos')
+    status_parser.add_argument('id', type=int, nargs='?', help='Detalle de un pedido')
+    retry_parser = commands.add_parser('retry', help='Reintenta un pedido fallido o cancelado')
+    retry_parser.add_argument('id', type=int)
+    cancel_parser = commands.add_parser('cancel', help='Cancela un pedido')
+    cancel_parser.add_argument('id', type=int)
+    args = parser.parse_args()
+
+    conn = connect()
+
+    if args.comando == 'add':
+        if args.canciones:
+            songs = read_song_file(args.canciones)
+        else:
+            playlists = load_script('generate_cards', 'generate-cards.py').load_playlists()
+            if args.categoria not in playlists:
+                print(f'❌ Categoría desconocida: {args.categoria}')
+                sys.exit(1)
+            songs = playlists[args.categoria]
+        formats = [f.strip().lower() for f in args.formatos.split(',') if f.strip()]
+        try:
+            job_id = add_order(conn, args.nombre, args.cliente, songs, args.tamano, args.cartones,
+                               formats=formats, theme=args.tema, title=args.titulo,
+                               priority=args.prioridad, max_attempts=args.intentos,
+                               memory_mb=args.memoria, seconds=args.segundos, seed=args.semilla)
+        except ValueError as e:
+            print(f'❌ Error: {e}')
+            sys.exit(1)
+        print(f'✅ Pedido #{job_id} en cola: {args.cartones} cartones {args.tamano} '
+              f'con {len(songs)} canciones para {args.cliente}')
+    elif args.comando == 'workers':
+        run_workers(args.procesos, args.max_por_cliente, once=args.una_vez)
+    elif args.comando == 'status':
+        show_status(conn, args.id)
+    elif args.comando == 'retry':
+        if not retry_order(conn, args.id):
+            print(f'❌ El pedido #{args.id} no existe o no está fallido ni cancelado')
+            sys.exit(1)
+        print(f'🔁 Pedido #{args.id} de nuevo en cola')
+    elif args.comando == 'cancel':
+        if not cancel_order(conn, args.id):
+            print(f'❌ El pedido #{args.id} no existe o ya ha terminado')
+            sys.exit(1)
+        print(f'🚫 Pedido #{args.id} cancelado')
+
+if __name__ == '__main__':
+    main()
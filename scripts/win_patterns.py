@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Reglas de premio de Bingo Musical como máscaras de bits
+Cada casilla de un cartón es un bit (fila * columnas + columna). Para cada
+formato de cartón se precalculan las jugadas ganadoras (línea, columna,
+esquinas y cartón lleno) como enteros, de modo que comprobar cualquier
+jugada es un AND y una comparación:
+
+    (marcadas & patron) == patron
+
+Las casillas libres (comodines y casillas vacías) forman la máscara de
+comodines, que se guarda con cada cartón y cuenta siempre como marcada.
+Ninguna jugada puede estar formada solo por casillas libres: se ganaría sin
+cantar ninguna canción.
+
+Con NumPy instalado, check_many() comprueba miles de cartones a la vez.
+"""
+
+import importlib.util
+import random
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Solo hace falta para las comprobaciones vectorizadas
+
+WILDCARD = 'COMODÍN'
+
+def _load_card_config():
+    """Canciones por cartón de scripts/generate-cards.py (el guion impide un import normal)"""
+    spec = importlib.util.spec_from_file_location('generate_cards', Path(__file__).parent / 'generate-cards.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.CONFIG
+
+CARD_CONFIG = _load_card_config()
+
+def _layout(size_type, rows, cols, wildcards):
+    """
+    Formato de cartón; con comodines lleva uno por fila. Imprime las canciones
+    de generate-cards.py que caben en el resto de casillas.
+    """
+    num_wildcards = rows if wildcards else 0
+    return {
+        'rows': rows,
+        'cols': cols,
+        'wildcards': num_wildcards,
+        'songs': min(CARD_CONFIG[size_type]['canciones'], rows * cols - num_wildcards),
+    }
+
+# Formatos de create_bingo_card_image(): filas × columnas, comodines y canciones impresas
+LAYOUTS = {
+    'pequeños': _layout('pequeños', 3, 4, wildcards=False),  # 8 canciones + 4 casillas vacías
+    'medianos': _layout('medianos', 4, 4, wildcards=True),   # 12 canciones + 4 comodines
+    'grandes': _layout('grandes', 5, 4, wildcards=True),     # 15 canciones + 5 comodines
+}
+
+def get_layout(size_type):
+    """Formato de un tamaño de cartón (medianos por defecto, como detect_card_size)"""
+    return LAYOUTS.get(size_type, LAYOUTS['medianos'])
+
+def empty_mask(size_type):
+    """
+    Casillas que quedan vacías en todos los cartones de un formato sin
+    comodines (las que sobran tras las canciones, en orden de lectura).
+    """
+    layout = get_layout(size_type)
+    if layout['wildcards']:
+        return 0
+    cells = layout['rows'] * layout['cols']
+    return ((1 << cells) - 1) & ~((1 << layout['songs']) - 1)
+
+def place_wildcards(size_type, rng=random):
+    """
+    Elige la posición de los comodines: uno por fila en una columna aleatoria,
+    repitiendo el sorteo si completan una jugada (p. ej. todos en la misma
+    columna). Devuelve la máscara de bits de las casillas comodín (0 si el
+    formato no lleva).
+    """
+    layout = get_layout(size_type)
+    if not layout['wildcards']:
+        return 0
+    while True:
+        mask = 0
+        for row in range(layout['rows']):
+            mask |= 1 << (row * layout['cols'] + rng.randint(0, layout['cols'] - 1))
+        if not winning_patterns(mask, size_type):
+            return mask
+
+def build_cells(songs, size_type, wildcard_mask):
+    """
+    Reparte las canciones en las casillas del cartón, en orden de lectura.
+
+    Returns:
+        (casillas, máscara de casillas libres). Las casillas libres son los
+        comodines y las que se quedan vacías por falta de canciones.
+
+    Raises:
+        ValueError: si las casillas libres ya completan alguna jugada
+    """
+    layout = get_layout(size_type)
+    songs = songs[:layout['songs']]
+    cells = []
+    free_mask = 0
+    song_idx = 0
+
+    for cell in range(layout['rows'] * layout['cols']):
+        if wildcard_mask >> cell & 1:
+            cells.append(WILDCARD)
+            free_mask |= 1 << cell
+        elif song_idx < len(songs):
+            cells.append(songs[song_idx])
+            song_idx += 1
+        else:
+            # Sin canciones suficientes: comodín en los formatos que los usan, vacía en el resto
+            cells.append(WILDCARD if layout['wildcards'] else '')
+            free_mask |= 1 << cell
+
+    free_wins = winning_patterns(free_mask, size_type)
+    if free_wins:
+        raise ValueError(f"Jugadas ganadas sin cantar ninguna canción: {', '.join(free_wins)}")
+    return cells, free_mask
+
+@lru_cache(maxsize=None)
+def win_patterns(size_type):
+    """
+    Jugadas ganadoras de un formato, precalculadas como máscaras. Se
+    descartan las que solo tienen casillas vacías (la última fila de los
+    pequeños), que se ganarían sin cantar nada.
+
+    Returns:
+        Diccionario {nombre: máscara}: 'linea-N', 'columna-N', 'esquinas', 'lleno'
+    """
+    layout = get_layout(size_type)
+    rows, cols = layout['rows'], layout['cols']
+    patterns = {}
+
+    row_mask = (1 << cols) - 1
+    for row in range(rows):
+        patterns[f'linea-{row + 1}'] = row_mask << (row * cols)
+
+    col_mask = sum(1 << (row * cols) for row in range(rows))
+    for col in range(cols):
+        patterns[f'columna-{col + 1}'] = col_mask << col
+
+    last = rows * cols - 1
+    patterns['esquinas'] = (1 << 0) | (1 << (cols - 1)) | (1 << (last - cols + 1)) | (1 << last)
+    patterns['lleno'] = (1 << (rows * cols)) - 1
+
+    empty = empty_mask(size_type)
+    return {name: mask for name, mask in patterns.items() if mask & ~empty}
+
+def cell_bits(cells):
+    """Diccionario canción → bit de su casilla"""
+    return {song: 1 << idx for idx, song in enumerate(cells) if song and song != WILDCARD}
+
+def marked_mask(cells, free_mask, called):
+    """Casillas marcadas de un cartón dado el conjunto de canciones cantadas"""
+    mask = free_mask
+    for song, bit in cell_bits(cells).items():
+        if song in called:
+            mask |= bit
+    return mask
+
+def check(marked, pattern):
+    """¿Cumple el cartón esta jugada?"""
+    return marked & pattern == pattern
+
+def winning_patterns(marked, size_type):
+    """Nombres de las jugadas que cumple un cartón"""
+    return [name for name, pattern in win_patterns(size_type).items() if marked & pattern == pattern]
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('NumPy es necesario para las comprobaciones vectorizadas: pip install numpy')
+
+def cell_matrix(cards_cells, songs):
+    """
+    Matriz (cartones × canciones) con el bit de la casilla de cada canción
+    en cada cartón (0 si el cartón no la tiene).
+    """
+    _require_numpy()
+    song_idx = {song: i for i, song in enumerate(songs)}
+    matrix = np.zeros((len(cards_cells), len(songs)), dtype=np.uint32)
+    for card_idx, cells in enumerate(cards_cells):
+        for song, bit in cell_bits(cells).items():
+            matrix[card_idx, song_idx[song]] = bit
+    return matrix
+
+def marked_many(matrix, free_masks, called_ids):
+    """Máscaras de casillas marcadas de todos los cartones a la vez"""
+    _require_numpy()
+    free = np.asarray(free_masks, dtype=np.uint32)
+    if len(called_ids) == 0:
+        return free
+    return np.bitwise_or.reduce(matrix[:, list(called_ids)], axis=1) | free
+
+def check_many(marked, size_type, names=None):
+    """
+    Comprueba todas las jugadas en todos los cartones.
+
+    Args:
+        marked: Array de máscaras marcadas (una por cartón)
+        size_type: Formato de los cartones
+        names: Jugadas a comprobar (por defecto, todas)
+
+    Returns:
+        (nombres, array booleano cartones × jugadas)
+    """
+    _require_numpy()
+    patterns = win_patterns(size_type)
+    names = list(names or patterns)
+    masks = np.array([patterns[name] for name in names], dtype=np.uint32)
+    marked = np.asarray(marked, dtype=np.uint32)
+    return names, (marked[:, None] & masks[None, :]) == masks[None, :]